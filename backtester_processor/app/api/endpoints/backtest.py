@@ -2,10 +2,11 @@
 Backtest API endpoint.
 """
 
-from fastapi import APIRouter, HTTPException
+from fastapi import APIRouter, HTTPException, Response
 
 from app.schemas.backtest import BacktestRequest, BacktestResponse, ErrorResponse
 from app.services.backtest_service import BacktestService
+from app.utils.serialization import dump_json_with_records
 from app.core.exceptions import (
     StrategyNotFoundError,
     MarketNotFoundError,
@@ -24,7 +25,7 @@ router = APIRouter()
         500: {"model": ErrorResponse, "description": "Internal server error"},
     },
 )
-async def run_backtest(request: BacktestRequest) -> BacktestResponse:
+async def run_backtest(request: BacktestRequest) -> Response:
     """
     Run a backtest with the specified strategy and market.
 
@@ -46,7 +47,12 @@ async def run_backtest(request: BacktestRequest) -> BacktestResponse:
 
     try:
         result = service.run_backtest(request)
-        return result
+        # Serialize directly (dataframe rows via orjson). Returning the model would
+        # make FastAPI re-validate it and walk every dataframe row in Python.
+        return Response(
+            content=dump_json_with_records(result, "dataframe"),
+            media_type="application/json",
+        )
 
     except StrategyNotFoundError as e:
         raise HTTPException(status_code=400, detail=str(e))
@@ -13,6 +13,13 @@ class Settings(BaseSettings):
     database_url: str
     default_fee_rate: Decimal = Decimal("0.001")
 
+    # Parallel DB fetches when loading trades for multi-market backtests
+    market_fetch_workers: int = 8
+
+    # In-process cache of formatted trade DataFrames, keyed by (market, limit)
+    trades_cache_size: int = 128
+    trades_cache_ttl_seconds: float = 300.0
+
     # CORS - comma-separated list of allowed origins, or "*" for development
     cors_origins: str = "http://localhost:3000"
 
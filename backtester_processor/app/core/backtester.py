@@ -6,9 +6,101 @@ Ensures no look-ahead bias by processing trades chronologically.
 from dataclasses import dataclass
 from decimal import Decimal
 from typing import Optional
+import numpy as np
 import pandas as pd
 
 from app.core.strategy import Strategy, Order, Trade, Position
+from app.utils.data import to_decimal_price
+
+
+class _RealizedPnL:
+    """
+    Running sum of realized PnL over a strategy's trades.
+
+    Same value as float(sum(t.pnl for t in trades)), but only the trades added
+    since the last call are summed.
+    """
+
+    def __init__(self, trades: list[Trade]):
+        self._trades = trades
+        self._count = 0
+        self._total = 0
+        self._value = 0.0
+
+    def current(self) -> float:
+        trades = self._trades
+        if len(trades) != self._count:
+            total = self._total
+            for trade in trades[self._count:]:
+                total += trade.pnl
+            self._total = total
+            self._count = len(trades)
+            self._value = float(total)
+        return self._value
+
+
+class _StateColumns:
+    """
+    Per-trade state columns of the result dataframe, preallocated for up to
+    capacity rows and filled in order.
+    """
+
+    def __init__(self, capacity: int):
+        self.count = 0
+        self.time: list[Optional[pd.Timestamp]] = [None] * capacity
+        self.equity = np.empty(capacity, dtype=np.float64)
+        self.cash = np.empty(capacity, dtype=np.float64)
+        self.realized_pnl = np.empty(capacity, dtype=np.float64)
+        self.unrealized_pnl = np.empty(capacity, dtype=np.float64)
+        self.position_size = np.empty(capacity, dtype=np.float64)
+        self.position_side: list[Optional[str]] = [None] * capacity
+
+    def append(
+        self,
+        time: pd.Timestamp,
+        equity: float,
+        cash: float,
+        realized_pnl: float,
+        unrealized_pnl: float,
+        position_size: float,
+        position_side: str,
+    ) -> None:
+        i = self.count
+        self.time[i] = time
+        self.equity[i] = equity
+        self.cash[i] = cash
+        self.realized_pnl[i] = realized_pnl
+        self.unrealized_pnl[i] = unrealized_pnl
+        self.position_size[i] = position_size
+        self.position_side[i] = position_side
+        self.count = i + 1
+
+    def set_last_flat(self, equity: float, cash: float, realized_pnl: float) -> None:
+        """Overwrite the last row with a closed position."""
+        i = self.count - 1
+        self.equity[i] = equity
+        self.cash[i] = cash
+        self.realized_pnl[i] = realized_pnl
+        self.unrealized_pnl[i] = 0.0
+        self.position_size[i] = 0.0
+        self.position_side[i] = "flat"
+
+    def columns(self) -> dict[str, object]:
+        """Filled rows of each result dataframe column."""
+        n = self.count
+        return {
+            "equity": self.equity[:n],
+            "cash": self.cash[:n],
+            "realized_pnl": self.realized_pnl[:n],
+            "unrealized_pnl": self.unrealized_pnl[:n],
+            "position_size": self.position_size[:n],
+            "position_side": self.position_side[:n],
+        }
+
+    def equity_curve(self) -> pd.Series:
+        """Equity indexed by trade time."""
+        n = self.count
+        return pd.Series(self.equity[:n], index=pd.Index(self.time[:n], name="time"), name="equity")
 
 
 @dataclass
@@ -87,6 +179,21 @@ class Backtester:
         """
         self.fee_rate = fee_rate
 
+    @staticmethod
+    def _sort_by_time(data: pd.DataFrame, time_col: str) -> pd.DataFrame:
+        """
+        Sort data by time with a fresh 0..n-1 index.
+
+        Ties keep their input order. Data that is already sorted with that
+        index (the usual case) is returned as is, without a copy.
+        """
+        if not data[time_col].is_monotonic_increasing:
+            return data.sort_values(time_col, kind="stable", ignore_index=True)
+        index = data.index
+        if isinstance(index, pd.RangeIndex) and index.start == 0 and index.step == 1:
+            return data
+        return data.reset_index(drop=True)
+
     def _force_close_position(
         self,
         strategy: Strategy,
@@ -156,56 +263,43 @@ class Backtester:
             raise ValueError("No market data provided")
 
         strategy.reset()
-        all_records = []
+        realized_pnl = _RealizedPnL(strategy.state.trades)
+        state = _StateColumns(sum(len(data) for _, data in market_data))
         all_dfs = []
 
         for market_idx, (market_id, data) in enumerate(market_data):
             if data.empty:
                 continue
 
-            df = data.sort_values(time_col).reset_index(drop=True)
+            df = self._sort_by_time(data, time_col)
+            if df is data:
+                # Already sorted: copy so market_id isn't added to the caller's frame
+                df = df.copy()
             df["market_id"] = market_id
+            strategy.prepare(df)
+
+            # Read prices, times and rows once instead of from each row. Rows
+            # have the same dtype and values df.iloc[i] would give.
+            prices = df[price_col].tolist()
+            times = df[time_col].tolist()
+            rows = df.to_numpy()
+            columns = df.columns
 
             for i in range(len(df)):
-                current_trade = df.iloc[i]
-                historical_data = df.iloc[: i + 1].copy()
+                current_trade = pd.Series(rows[i], index=columns, name=i)
+                # Row slices are views, so this doesn't copy the history each trade
+                historical_data = df.iloc[: i + 1]
 
                 orders = strategy.on_trade(current_trade, historical_data)
 
-                current_price = Decimal(str(current_trade[price_col]))
-                current_time = pd.Timestamp(current_trade[time_col])
+                current_price = to_decimal_price(prices[i])
+                current_time = pd.Timestamp(times[i])
 
                 for order in orders:
                     self._execute_order(strategy, order, current_price, current_time)
 
                 # Calculate current state
-                equity = self._calculate_equity(strategy, current_price)
-                cash = strategy.state.balance
-                realized_pnl = sum(t.pnl for t in strategy.state.trades)
-
-                if strategy.state.position:
-                    pos = strategy.state.position
-                    position_size = float(pos.size) if pos.side == "long" else -float(pos.size)
-                    position_side = pos.side
-                    if pos.side == "long":
-                        unrealized = (current_price - pos.entry_price) * pos.size
-                    else:
-                        unrealized = (pos.entry_price - current_price) * pos.size
-                else:
-                    position_size = 0.0
-                    position_side = "flat"
-                    unrealized = Decimal("0")
-
-                all_records.append({
-                    "time": current_time,
-                    "equity": float(equity),
-                    "cash": float(cash),
-                    "realized_pnl": float(realized_pnl),
-                    "unrealized_pnl": float(unrealized),
-                    "position_size": position_size,
-                    "position_side": position_side,
-                    "market_id": market_id,
-                })
+                self._record_state(state, strategy, current_price, current_time, realized_pnl)
 
             # At end of market, force close any open position
             if not df.empty and strategy.state.position is not None:
@@ -215,31 +309,28 @@ class Backtester:
                 self._force_close_position(strategy, last_price, last_time)
 
                 # Update the last record with closed position state
-                if all_records:
+                if state.count:
                     equity = self._calculate_equity(strategy, last_price)
-                    all_records[-1]["equity"] = float(equity)
-                    all_records[-1]["cash"] = float(strategy.state.balance)
-                    all_records[-1]["realized_pnl"] = float(sum(t.pnl for t in strategy.state.trades))
-                    all_records[-1]["unrealized_pnl"] = 0.0
-                    all_records[-1]["position_size"] = 0.0
-                    all_records[-1]["position_side"] = "flat"
+                    state.set_last_flat(
+                        float(equity), float(strategy.state.balance), realized_pnl.current()
+                    )
 
             all_dfs.append(df)
 
         strategy.on_end()
 
-        # Combine all dataframes
+        # Combine all dataframes in one concat. The per-market frames are our
+        # own sorted copies, so they don't need copying again.
         if all_dfs:
-            result_df = pd.concat(all_dfs, ignore_index=True)
+            result_df = pd.concat(all_dfs, ignore_index=True, copy=False)
         else:
             result_df = pd.DataFrame()
 
-        if all_records:
-            state_df = pd.DataFrame(all_records)
-            for col in ["equity", "cash", "realized_pnl", "unrealized_pnl", "position_size", "position_side", "market_id"]:
-                if col in state_df.columns:
-                    result_df[col] = state_df[col].values
-            equity_series = state_df.set_index("time")["equity"]
+        if state.count:
+            # market_id is already set on each market's rows
+            for col, values in state.columns().items():
+                result_df[col] = values
+            equity_series = state.equity_curve()
         else:
             for col in ["equity", "cash", "realized_pnl", "unrealized_pnl", "position_size", "position_side"]:
                 result_df[col] = pd.Series(dtype=float)
@@ -268,60 +359,43 @@ class Backtester:
         Returns:
             BacktestResult with .statistics and .dataframe
         """
-        df = data.sort_values(time_col).reset_index(drop=True)
+        df = self._sort_by_time(data, time_col)
         strategy.reset()
+        strategy.prepare(df)
+        realized_pnl = _RealizedPnL(strategy.state.trades)
+        state = _StateColumns(len(df))
 
-        records = []
+        # Read prices, times and rows once instead of from each row. Rows
+        # have the same dtype and values df.iloc[i] would give.
+        prices = df[price_col].tolist()
+        times = df[time_col].tolist()
+        rows = df.to_numpy()
+        columns = df.columns
 
         for i in range(len(df)):
-            current_trade = df.iloc[i]
-            historical_data = df.iloc[: i + 1].copy()
+            current_trade = pd.Series(rows[i], index=columns, name=i)
+            # Row slices are views, so this doesn't copy the history each trade
+            historical_data = df.iloc[: i + 1]
 
             orders = strategy.on_trade(current_trade, historical_data)
 
-            current_price = Decimal(str(current_trade[price_col]))
-            current_time = pd.Timestamp(current_trade[time_col])
+            current_price = to_decimal_price(prices[i])
+            current_time = pd.Timestamp(times[i])
 
             for order in orders:
                 self._execute_order(strategy, order, current_price, current_time)
 
             # Calculate current state
-            equity = self._calculate_equity(strategy, current_price)
-            cash = strategy.state.balance
-            realized_pnl = sum(t.pnl for t in strategy.state.trades)
-
-            if strategy.state.position:
-                pos = strategy.state.position
-                position_size = float(pos.size) if pos.side == "long" else -float(pos.size)
-                position_side = pos.side
-                if pos.side == "long":
-                    unrealized = (current_price - pos.entry_price) * pos.size
-                else:
-                    unrealized = (pos.entry_price - current_price) * pos.size
-            else:
-                position_size = 0.0
-                position_side = "flat"
-                unrealized = Decimal("0")
-
-            records.append({
-                "time": current_time,
-                "equity": float(equity),
-                "cash": float(cash),
-                "realized_pnl": float(realized_pnl),
-                "unrealized_pnl": float(unrealized),
-                "position_size": position_size,
-                "position_side": position_side,
-            })
+            self._record_state(state, strategy, current_price, current_time, realized_pnl)
 
         strategy.on_end()
 
         # Build detailed dataframe
         result_df = df.copy()
-        if records:
-            state_df = pd.DataFrame(records)
-            for col in ["equity", "cash", "realized_pnl", "unrealized_pnl", "position_size", "position_side"]:
-                result_df[col] = state_df[col]
-            equity_series = state_df.set_index("time")["equity"]
+        if state.count:
+            for col, values in state.columns().items():
+                result_df[col] = values
+            equity_series = state.equity_curve()
         else:
             for col in ["equity", "cash", "realized_pnl", "unrealized_pnl", "position_size", "position_side"]:
                 result_df[col] = pd.Series(dtype=float)
@@ -402,6 +476,47 @@ class Backtester:
                 strategy.state.balance += exec_price * pos.size - fee
                 strategy.state.position = None
 
+    def _record_state(
+        self,
+        state: _StateColumns,
+        strategy: Strategy,
+        current_price: Decimal,
+        current_time: pd.Timestamp,
+        realized_pnl: "_RealizedPnL",
+    ) -> None:
+        """
+        Append the per-trade state row for the result dataframe.
+
+        Accounting stays in Decimal; only the position-dependent values need
+        Decimal math per trade, and only while a position is open.
+        """
+        cash = float(strategy.state.balance)
+        pos = strategy.state.position
+        if pos:
+            equity = float(self._calculate_equity(strategy, current_price))
+            position_size = float(pos.size) if pos.side == "long" else -float(pos.size)
+            position_side = pos.side
+            if pos.side == "long":
+                unrealized = float((current_price - pos.entry_price) * pos.size)
+            else:
+                unrealized = float((pos.entry_price - current_price) * pos.size)
+        else:
+            # Flat: equity is the balance
+            equity = cash
+            position_size = 0.0
+            position_side = "flat"
+            unrealized = 0.0
+
+        state.append(
+            current_time,
+            equity,
+            cash,
+            realized_pnl.current(),
+            unrealized,
+            position_size,
+            position_side,
+        )
+
     def _calculate_equity(self, strategy: Strategy, current_price: Decimal) -> Decimal:
         """
         Calculate current equity = cash + position market value.
@@ -430,8 +545,9 @@ class Backtester:
     def _build_statistics(self, strategy: Strategy, equity_series: pd.Series) -> BacktestStatistics:
         """Build backtest statistics from strategy state."""
         trades = strategy.state.trades
-        winning = [t for t in trades if t.pnl > 0]
-        losing = [t for t in trades if t.pnl <= 0]
+        # Counted in one pass; every trade that isn't a win is a loss (pnl <= 0)
+        winning = sum(1 for t in trades if t.pnl > 0)
+        losing = len(trades) - winning
 
         initial = float(strategy.initial_balance)
         final_equity = equity_series.iloc[-1] if len(equity_series) > 0 else initial
@@ -460,9 +576,9 @@ class Backtester:
             total_pnl=total_pnl,
             total_return_pct=total_return_pct,
             total_trades=len(trades),
-            winning_trades=len(winning),
-            losing_trades=len(losing),
-            win_rate=len(winning) / len(trades) if trades else 0.0,
+            winning_trades=winning,
+            losing_trades=losing,
+            win_rate=winning / len(trades) if trades else 0.0,
             max_drawdown=Decimal(str(max_dd)),
             max_drawdown_pct=float(max_dd_pct),
             sharpe_ratio=sharpe,
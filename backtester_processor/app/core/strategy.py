@@ -9,7 +9,7 @@ from typing import Optional
 import pandas as pd
 
 
-@dataclass
+@dataclass(slots=True)
 class Position:
     """Represents a trading position."""
     side: str  # "long" or "short"
@@ -19,16 +19,21 @@ class Position:
     entry_fee: Decimal = Decimal("0")
 
 
-@dataclass
+@dataclass(slots=True)
 class Order:
-    """Represents a trade order."""
+    """
+    Represents a trade order.
+
+    Created per signal on the backtest hot path, so slotted and unvalidated;
+    request/response validation happens in the API schemas.
+    """
     side: str  # "buy" or "sell"
     price: Decimal
     size: Decimal
     order_type: str = "limit"  # "limit" or "market"
 
 
-@dataclass
+@dataclass(slots=True)
 class Trade:
     """Represents an executed trade."""
     side: str
@@ -38,7 +43,7 @@ class Trade:
     pnl: Decimal = Decimal("0")
 
 
-@dataclass
+@dataclass(slots=True)
 class StrategyState:
     """Holds the current state of a strategy."""
     balance: Decimal = Decimal("10000")
@@ -70,13 +75,24 @@ class Strategy(ABC):
 
         Args:
             trade_data: Current trade row (price, side, size, timestamp, etc.)
-            historical_data: All trades UP TO AND INCLUDING current trade (no future data)
+            historical_data: All trades UP TO AND INCLUDING current trade (no future data).
+                A view of the market's data: treat it as read-only.
 
         Returns:
             List of orders to execute
         """
         pass
 
+    def prepare(self, data: pd.DataFrame) -> None:
+        """
+        Called with a market's full, time-sorted data after reset() and before
+        its first on_trade(). Override to precompute per-row series in one pass.
+
+        Anything computed here must only use rows up to the row it is used for,
+        otherwise it introduces look-ahead bias.
+        """
+        pass
+
     def on_start(self) -> None:
         """Called before backtest starts. Override for initialization."""
         pass
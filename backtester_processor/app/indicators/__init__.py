@@ -40,6 +40,7 @@ from app.indicators.bollinger import BollingerBands
 from app.indicators.manager import (
     IndicatorManager,
     IndicatorSnapshot,
+    IndicatorSeries,
     ManagerState,
     IndicatorError,
     IndicatorNotReadyError,
@@ -61,6 +62,7 @@ __all__ = [
     # Manager
     "IndicatorManager",
     "IndicatorSnapshot",
+    "IndicatorSeries",
     "ManagerState",
     # Exceptions
     "IndicatorError",
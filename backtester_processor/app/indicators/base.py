@@ -3,12 +3,16 @@ Base indicator class with proper handling for stateful/continuous indicators.
 """
 
 from abc import ABC, abstractmethod
+from collections import deque
 from dataclasses import dataclass, field
 from decimal import Decimal
-from typing import Optional, Any
+from typing import Optional, Any, Union
 
+import numpy as np
+from numpy.lib.stride_tricks import sliding_window_view
 
-@dataclass
+
+@dataclass(slots=True)
 class IndicatorConfig:
     """Configuration metadata for an indicator."""
     name: str
@@ -30,11 +34,24 @@ class Indicator(ABC):
        - Must call reset() before each backtest run
        - Output unreliable until warmup_period samples processed
        - State depends on entire history, not just recent window
+
+    Internal state is float64. Subclasses implement _update() on floats;
+    update() accepts float or Decimal prices. Outputs (update()'s result,
+    value and any extra outputs of composite indicators) are Decimal while
+    the indicator is fed Decimal prices, float otherwise. compute() processes
+    a whole float price array at once and can be overridden with a
+    vectorized version.
     """
 
+    # Indicators are slotted; subclasses declare their own state attributes
+    __slots__ = ("_samples_processed", "_current_value", "_warmup_period", "_decimal_output")
+
     def __init__(self):
         self._samples_processed: int = 0
-        self._current_value: Optional[Decimal] = None
+        self._current_value: Optional[float] = None
+        self._warmup_period: Optional[int] = None
+        # True after update() got a Decimal price: outputs are returned as Decimal
+        self._decimal_output: bool = False
 
     @property
     @abstractmethod
@@ -48,7 +65,12 @@ class Indicator(ABC):
 
     @property
     def warmup_period(self) -> int:
-        return self.config.warmup_period
+        # config builds a new IndicatorConfig per access and is_ready is
+        # checked on every update; the warmup only depends on constructor
+        # parameters, so look it up once
+        if self._warmup_period is None:
+            self._warmup_period = self.config.warmup_period
+        return self._warmup_period
 
     @property
     def is_stateful(self) -> bool:
@@ -60,14 +82,13 @@ class Indicator(ABC):
         return self._samples_processed >= self.warmup_period
 
     @property
-    def value(self) -> Optional[Decimal]:
+    def value(self) -> Union[float, Decimal, None]:
         """Current indicator value. None if not ready."""
         if not self.is_ready:
             return None
-        return self._current_value
+        return self._output(self._current_value)
 
-    @abstractmethod
-    def update(self, price: Decimal) -> Optional[Decimal]:
+    def update(self, price: Union[float, Decimal]) -> Union[float, Decimal, None]:
         """
         Process a new price and return the updated indicator value.
 
@@ -75,10 +96,46 @@ class Indicator(ABC):
             price: New price to process
 
         Returns:
-            Current indicator value, or None if still in warmup period
+            Current indicator value, or None if still in warmup period.
+            A Decimal price gets a Decimal result, anything else a float.
         """
+        self._decimal_output = type(price) is Decimal
+        return self._output(self._update(float(price)))
+
+    def _output(self, value: Optional[float]) -> Union[float, Decimal, None]:
+        """Return an internal float value in the type of the prices fed to update()."""
+        if value is not None and self._decimal_output:
+            return Decimal(repr(value))
+        return value
+
+    @abstractmethod
+    def _update(self, price: float) -> Optional[float]:
+        """Process a new float price. Returns the current value or None during warmup."""
         pass
 
+    def compute(self, prices: np.ndarray) -> np.ndarray:
+        """
+        Process a whole price series at once.
+
+        Equivalent to calling update() for each price: the indicator ends up in
+        the same state, and the result holds what update() would have returned
+        for each price (NaN instead of None).
+        """
+        self._decimal_output = False
+        out = np.full(len(prices), np.nan)
+        for i, price in enumerate(np.asarray(prices, dtype=np.float64).tolist()):
+            value = self._update(price)
+            if value is not None:
+                out[i] = value
+        return out
+
+    def compute_all(self, prices: np.ndarray) -> dict[str, np.ndarray]:
+        """
+        compute() plus any extra outputs of composite indicators (e.g. MACD's
+        signal line), keyed by output name. The main output is "value".
+        """
+        return {"value": self.compute(prices)}
+
     def reset(self) -> None:
         """
         Reset indicator state. MUST be called before each backtest run
@@ -86,6 +143,7 @@ class Indicator(ABC):
         """
         self._samples_processed = 0
         self._current_value = None
+        self._decimal_output = False
         self._reset_state()
 
     @abstractmethod
@@ -97,3 +155,21 @@ class Indicator(ABC):
         params_str = ", ".join(f"{k}={v}" for k, v in self.config.params.items())
         ready_str = "ready" if self.is_ready else f"warmup {self._samples_processed}/{self.warmup_period}"
         return f"{self.name}({params_str}) [{ready_str}]"
+
+
+def _trailing_windows(
+    window: deque[float], prices: np.ndarray, period: int
+) -> tuple[np.ndarray, int]:
+    """
+    Full `period`-long windows for a window-based indicator fed `prices`.
+
+    The indicator's current window is used as history. Returns (windows, first)
+    where windows[k] is the window ending at prices[first + k]; prices before
+    `first` don't have a full window yet.
+    """
+    history = np.concatenate((np.array(window, dtype=np.float64), prices))
+    first = max(0, period - 1 - len(window))
+    if len(history) < period:
+        return np.empty((0, period)), len(prices)
+    windows = sliding_window_view(history, period)[len(window) + first - period + 1:]
+    return windows, first
@@ -4,10 +4,12 @@ Bollinger Bands indicator.
 
 from collections import deque
 from decimal import Decimal
-from typing import Optional
+from typing import Optional, Union
 import math
 
-from app.indicators.base import Indicator, IndicatorConfig
+import numpy as np
+
+from app.indicators.base import Indicator, IndicatorConfig, _trailing_windows
 
 
 class BollingerBands(Indicator):
@@ -30,18 +32,29 @@ class BollingerBands(Indicator):
     - Band expansion: High volatility
     """
 
+    __slots__ = (
+        "period",
+        "num_std",
+        "_num_std",
+        "_window",
+        "_upper",
+        "_lower",
+        "_bandwidth",
+    )
+
     def __init__(self, period: int = 20, num_std: Decimal = Decimal("2")):
         super().__init__()
         if period < 2:
             raise ValueError("Period must be >= 2 for standard deviation")
         self.period = period
         self.num_std = num_std
-        self._window: deque[Decimal] = deque(maxlen=period)
+        self._num_std = float(num_std)
+        self._window: deque[float] = deque(maxlen=period)
 
         # Additional outputs
-        self._upper: Optional[Decimal] = None
-        self._lower: Optional[Decimal] = None
-        self._bandwidth: Optional[Decimal] = None
+        self._upper: Optional[float] = None
+        self._lower: Optional[float] = None
+        self._bandwidth: Optional[float] = None
 
     @property
     def config(self) -> IndicatorConfig:
@@ -53,26 +66,29 @@ class BollingerBands(Indicator):
         )
 
     @property
-    def upper(self) -> Optional[Decimal]:
+    def upper(self) -> Union[float, Decimal, None]:
         """Upper band value."""
-        return self._upper
+        return self._output(self._upper)
 
     @property
-    def lower(self) -> Optional[Decimal]:
+    def lower(self) -> Union[float, Decimal, None]:
         """Lower band value."""
-        return self._lower
+        return self._output(self._lower)
 
     @property
-    def middle(self) -> Optional[Decimal]:
+    def middle(self) -> Union[float, Decimal, None]:
         """Middle band (SMA) value."""
-        return self._current_value
+        return self._output(self._current_value)
 
     @property
-    def bandwidth(self) -> Optional[Decimal]:
+    def bandwidth(self) -> Union[float, Decimal, None]:
         """Bandwidth: (upper - lower) / middle. Measures volatility."""
-        return self._bandwidth
+        if self._decimal_output and self._bandwidth is not None and self._current_value:
+            # From the Decimal bands, so bandwidth == (upper - lower) / middle exactly
+            return (self.upper - self.lower) / self.middle
+        return self._output(self._bandwidth)
 
-    def update(self, price: Decimal) -> Optional[Decimal]:
+    def _update(self, price: float) -> Optional[float]:
         self._window.append(price)
         self._samples_processed += 1
 
@@ -80,23 +96,77 @@ class BollingerBands(Indicator):
             return None
 
         # Calculate SMA (middle band)
-        sma = sum(self._window) / Decimal(self.period)
+        sma = sum(self._window) / self.period
         self._current_value = sma
 
-        # Calculate standard deviation
-        variance = sum((p - sma) ** 2 for p in self._window) / Decimal(self.period)
-        std_dev = Decimal(str(math.sqrt(float(variance))))
+        # Calculate standard deviation (a list comprehension sums faster
+        # than a generator)
+        variance = sum([(p - sma) ** 2 for p in self._window]) / self.period
+        std_dev = math.sqrt(variance)
 
         # Calculate bands
-        self._upper = sma + (std_dev * self.num_std)
-        self._lower = sma - (std_dev * self.num_std)
+        band = std_dev * self._num_std
+        self._upper = sma + band
+        self._lower = sma - band
 
         # Bandwidth
-        if sma != Decimal(0):
+        if sma != 0:
             self._bandwidth = (self._upper - self._lower) / sma
 
         return self._current_value
 
+    def compute(self, prices: np.ndarray) -> np.ndarray:
+        return self.compute_all(prices)["value"]
+
+    def compute_all(self, prices: np.ndarray) -> dict[str, np.ndarray]:
+        self._decimal_output = False
+        prices = np.asarray(prices, dtype=np.float64)
+        n = len(prices)
+        middle = np.full(n, np.nan)
+        upper = np.full(n, np.nan)
+        lower = np.full(n, np.nan)
+        bandwidth = np.full(n, np.nan)
+
+        windows, first = _trailing_windows(self._window, prices, self.period)
+        if len(windows):
+            sma = windows.sum(axis=1) / self.period
+            variance = ((windows - sma[:, None]) ** 2).sum(axis=1) / self.period
+            std_dev = np.sqrt(variance)
+
+            band = std_dev * self._num_std
+            middle[first:] = sma
+            upper[first:] = sma + band
+            lower[first:] = sma - band
+
+            with np.errstate(divide="ignore", invalid="ignore"):
+                width = (upper[first:] - lower[first:]) / sma
+
+            # A zero middle band keeps the previous bandwidth, like _update()
+            nonzero = sma != 0
+            if not nonzero.all():
+                last = np.where(nonzero, np.arange(len(sma)), -1)
+                np.maximum.accumulate(last, out=last)
+                previous = np.nan if self._bandwidth is None else self._bandwidth
+                width = np.where(last >= 0, width[last], previous)
+            bandwidth[first:] = width
+
+        self._window.extend(prices[-self.period:].tolist())
+        self._samples_processed += n
+        if n and self.is_ready:
+            self._current_value = float(middle[-1])
+            self._upper = float(upper[-1])
+            self._lower = float(lower[-1])
+            if not np.isnan(bandwidth[-1]):
+                self._bandwidth = float(bandwidth[-1])
+
+        return {
+            "value": middle,
+            "upper": upper,
+            "lower": lower,
+            "middle": middle,
+            "bandwidth": bandwidth,
+        }
+
     def _reset_state(self) -> None:
         self._window.clear()
         self._upper = None
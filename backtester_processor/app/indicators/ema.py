@@ -2,9 +2,10 @@
 Exponential Moving Average indicator.
 """
 
-from decimal import Decimal
 from typing import Optional
 
+import numpy as np
+
 from app.indicators.base import Indicator, IndicatorConfig
 
 
@@ -25,13 +26,16 @@ class EMA(Indicator):
        The EMA value depends on the entire price history.
     """
 
+    __slots__ = ("period", "_multiplier", "_decay", "_warmup_prices")
+
     def __init__(self, period: int = 20):
         super().__init__()
         if period < 1:
             raise ValueError("Period must be >= 1")
         self.period = period
-        self._multiplier = Decimal(2) / Decimal(period + 1)
-        self._warmup_prices: list[Decimal] = []
+        self._multiplier = 2.0 / (period + 1)
+        self._decay = 1.0 - self._multiplier
+        self._warmup_prices: list[float] = []
 
     @property
     def config(self) -> IndicatorConfig:
@@ -42,7 +46,7 @@ class EMA(Indicator):
             is_stateful=True,  # IMPORTANT: This is a continuous indicator
         )
 
-    def update(self, price: Decimal) -> Optional[Decimal]:
+    def _update(self, price: float) -> Optional[float]:
         self._samples_processed += 1
 
         # During warmup: collect prices for initial SMA
@@ -50,16 +54,44 @@ class EMA(Indicator):
             self._warmup_prices.append(price)
             if len(self._warmup_prices) >= self.period:
                 # Initialize EMA with SMA of first `period` prices
-                self._current_value = sum(self._warmup_prices) / Decimal(self.period)
+                self._current_value = sum(self._warmup_prices) / self.period
             return self._current_value
 
         # After warmup: apply EMA formula
         # EMA = price * multiplier + previous_EMA * (1 - multiplier)
         self._current_value = (
             price * self._multiplier +
-            self._current_value * (Decimal(1) - self._multiplier)
+            self._current_value * self._decay
         )
         return self._current_value
 
+    def compute(self, prices: np.ndarray) -> np.ndarray:
+        self._decimal_output = False
+        values = np.asarray(prices, dtype=np.float64).tolist()
+        out = np.full(len(values), np.nan)
+        current = self._current_value
+        i = 0
+
+        # Warmup: collect prices for the initial SMA
+        while current is None and i < len(values):
+            self._warmup_prices.append(values[i])
+            if len(self._warmup_prices) >= self.period:
+                current = sum(self._warmup_prices) / self.period
+                out[i] = current
+            i += 1
+
+        # After warmup: same recurrence as _update(), without per-call overhead
+        multiplier = self._multiplier
+        decay = self._decay
+        ema = []
+        for price in values[i:]:
+            current = price * multiplier + current * decay
+            ema.append(current)
+        out[i:] = ema
+
+        self._current_value = current
+        self._samples_processed += len(values)
+        return out
+
     def _reset_state(self) -> None:
         self._warmup_prices = []
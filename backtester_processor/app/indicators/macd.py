@@ -3,7 +3,9 @@ MACD (Moving Average Convergence Divergence) indicator.
 """
 
 from decimal import Decimal
-from typing import Optional
+from typing import Optional, Union
+
+import numpy as np
 
 from app.indicators.base import Indicator, IndicatorConfig
 from app.indicators.ema import EMA
@@ -28,6 +30,17 @@ class MACD(Indicator):
     - Histogram shows momentum strength
     """
 
+    __slots__ = (
+        "fast_period",
+        "slow_period",
+        "signal_period",
+        "_fast_ema",
+        "_slow_ema",
+        "_signal_ema",
+        "_signal_value",
+        "_histogram",
+    )
+
     def __init__(
         self,
         fast_period: int = 12,
@@ -49,8 +62,8 @@ class MACD(Indicator):
         self._signal_ema = EMA(signal_period)
 
         # Additional outputs
-        self._signal_value: Optional[Decimal] = None
-        self._histogram: Optional[Decimal] = None
+        self._signal_value: Optional[float] = None
+        self._histogram: Optional[float] = None
 
     @property
     def config(self) -> IndicatorConfig:
@@ -67,16 +80,19 @@ class MACD(Indicator):
         )
 
     @property
-    def signal(self) -> Optional[Decimal]:
+    def signal(self) -> Union[float, Decimal, None]:
         """Signal line value."""
-        return self._signal_value
+        return self._output(self._signal_value)
 
     @property
-    def histogram(self) -> Optional[Decimal]:
+    def histogram(self) -> Union[float, Decimal, None]:
         """MACD histogram (MACD - Signal)."""
+        if self._decimal_output and self._histogram is not None:
+            # From the Decimal outputs, so histogram == value - signal exactly
+            return self._output(self._current_value) - self._output(self._signal_value)
         return self._histogram
 
-    def update(self, price: Decimal) -> Optional[Decimal]:
+    def _update(self, price: float) -> Optional[float]:
         self._samples_processed += 1
 
         fast = self._fast_ema.update(price)
@@ -97,6 +113,31 @@ class MACD(Indicator):
 
         return self._current_value
 
+    def compute(self, prices: np.ndarray) -> np.ndarray:
+        return self.compute_all(prices)["value"]
+
+    def compute_all(self, prices: np.ndarray) -> dict[str, np.ndarray]:
+        self._decimal_output = False
+        prices = np.asarray(prices, dtype=np.float64)
+
+        # MACD line is NaN until both EMAs are ready
+        macd_line = self._fast_ema.compute(prices) - self._slow_ema.compute(prices)
+        has_macd = ~np.isnan(macd_line)
+
+        # Signal line only sees MACD values, like in _update()
+        signal = np.full(len(prices), np.nan)
+        signal[has_macd] = self._signal_ema.compute(macd_line[has_macd])
+        histogram = macd_line - signal
+
+        self._samples_processed += len(prices)
+        if len(prices) and has_macd[-1]:
+            self._current_value = float(macd_line[-1])
+            if not np.isnan(signal[-1]):
+                self._signal_value = float(signal[-1])
+                self._histogram = float(histogram[-1])
+
+        return {"value": macd_line, "signal": signal, "histogram": histogram}
+
     def _reset_state(self) -> None:
         self._fast_ema.reset()
         self._slow_ema.reset()
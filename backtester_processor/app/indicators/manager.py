@@ -3,10 +3,12 @@ Indicator Manager - enforces proper usage of indicators and prevents common mist
 """
 
 from decimal import Decimal
-from typing import Optional, TypeVar, Type
+from typing import Optional, TypeVar, Type, Union
 from dataclasses import dataclass, field
 from enum import Enum, auto
 
+import numpy as np
+
 from app.indicators.base import Indicator, IndicatorConfig
 
 
@@ -43,14 +45,14 @@ class IndicatorNotFoundError(IndicatorError):
     pass
 
 
-@dataclass
+@dataclass(slots=True)
 class IndicatorSnapshot:
     """Snapshot of all indicator values at a point in time."""
-    values: dict[str, Optional[Decimal]]
+    values: dict[str, Union[float, Decimal, None]]
     ready_status: dict[str, bool]
     samples_processed: int
 
-    def get(self, name: str, default: Optional[Decimal] = None) -> Optional[Decimal]:
+    def get(self, name: str, default: Optional[float] = None) -> Union[float, Decimal, None]:
         """Get indicator value by name, with optional default."""
         return self.values.get(name, default)
 
@@ -64,6 +66,14 @@ class IndicatorSnapshot:
         return all(self.ready_status.values())
 
 
+@dataclass(slots=True)
+class IndicatorSeries:
+    """All indicator values over a price series, one array entry per price."""
+    values: dict[str, np.ndarray]  # NaN where an indicator had no value
+    all_ready: np.ndarray  # True where every indicator had completed warmup
+    samples_processed: int
+
+
 T = TypeVar("T", bound=Indicator)
 
 
@@ -103,6 +113,8 @@ class IndicatorManager:
                         If False, returns None/logs warnings instead.
         """
         self._indicators: dict[str, Indicator] = {}
+        # (name, indicator) pairs in insertion order, iterated by update()
+        self._entries: list[tuple[str, Indicator]] = []
         self._state: ManagerState = ManagerState.UNINITIALIZED
         self._samples_processed: int = 0
         self._strict_mode = strict_mode
@@ -154,6 +166,7 @@ class IndicatorManager:
             raise DuplicateIndicatorError(f"Indicator '{name}' already exists")
 
         self._indicators[name] = indicator
+        self._entries.append((name, indicator))
 
         # Mark as dirty if we were running (need reset for new indicator)
         if self._state == ManagerState.RUNNING:
@@ -177,7 +190,9 @@ class IndicatorManager:
         if name not in self._indicators:
             raise IndicatorNotFoundError(f"Indicator '{name}' not found")
 
-        return self._indicators.pop(name)
+        indicator = self._indicators.pop(name)
+        self._entries = list(self._indicators.items())
+        return indicator
 
     def get(self, name: str, indicator_type: Optional[Type[T]] = None) -> Indicator:
         """
@@ -193,12 +208,13 @@ class IndicatorManager:
         Raises:
             IndicatorNotFoundError: If indicator doesn't exist
         """
-        if name not in self._indicators:
+        indicator = self._indicators.get(name)
+        if indicator is None:
             raise IndicatorNotFoundError(f"Indicator '{name}' not found")
 
-        return self._indicators[name]
+        return indicator
 
-    def get_value(self, name: str, require_ready: bool = True) -> Optional[Decimal]:
+    def get_value(self, name: str, require_ready: bool = True) -> Union[float, Decimal, None]:
         """
         Get current value of an indicator.
 
@@ -239,7 +255,7 @@ class IndicatorManager:
         self._state = ManagerState.READY
         return self
 
-    def update(self, price: Decimal) -> IndicatorSnapshot:
+    def update(self, price: Union[float, Decimal]) -> IndicatorSnapshot:
         """
         Update all indicators with a new price.
 
@@ -247,32 +263,18 @@ class IndicatorManager:
             price: New price value
 
         Returns:
-            Snapshot of all indicator values
+            Snapshot of all indicator values (Decimal if price is a Decimal, else float)
 
         Raises:
             ManagerNotResetError: If reset() wasn't called first
         """
-        # Check state
-        if self._state == ManagerState.UNINITIALIZED:
-            if self._strict_mode:
-                raise ManagerNotResetError(
-                    "Manager has no indicators. Add indicators then call reset()."
-                )
-
-        if self._state == ManagerState.DIRTY:
-            if self._strict_mode:
-                raise ManagerNotResetError(
-                    "Manager state is dirty. Call reset() before processing."
-                )
-
-        if self._state == ManagerState.READY:
-            self._state = ManagerState.RUNNING
+        self._start_update()
 
         # Update all indicators
-        values: dict[str, Optional[Decimal]] = {}
+        values: dict[str, Union[float, Decimal, None]] = {}
         ready_status: dict[str, bool] = {}
 
-        for name, indicator in self._indicators.items():
+        for name, indicator in self._entries:
             values[name] = indicator.update(price)
             ready_status[name] = indicator.is_ready
 
@@ -284,6 +286,60 @@ class IndicatorManager:
             samples_processed=self._samples_processed,
         )
 
+    def compute(self, prices: np.ndarray) -> IndicatorSeries:
+        """
+        Update all indicators with a whole price series at once.
+
+        Leaves the indicators in the same state as calling update() for each
+        price. Composite indicators also get their extra outputs as
+        "<name>_<output>" (e.g. "macd_signal", "bb_upper").
+
+        Args:
+            prices: Price array
+
+        Returns:
+            Per-price values of every indicator, plus an all-ready mask
+
+        Raises:
+            ManagerNotResetError: If reset() wasn't called first
+        """
+        self._start_update()
+
+        prices = np.asarray(prices, dtype=np.float64)
+        counts = np.arange(1, len(prices) + 1)
+        all_ready = np.ones(len(prices), dtype=bool)
+        values: dict[str, np.ndarray] = {}
+
+        for name, indicator in self._indicators.items():
+            all_ready &= indicator._samples_processed + counts >= indicator.warmup_period
+            for output, series in indicator.compute_all(prices).items():
+                values[name if output == "value" else f"{name}_{output}"] = series
+
+        self._samples_processed += len(prices)
+
+        return IndicatorSeries(
+            values=values,
+            all_ready=all_ready,
+            samples_processed=self._samples_processed,
+        )
+
+    def _start_update(self) -> None:
+        """Check the manager may process data and move it to RUNNING."""
+        if self._state == ManagerState.UNINITIALIZED:
+            if self._strict_mode:
+                raise ManagerNotResetError(
+                    "Manager has no indicators. Add indicators then call reset()."
+                )
+
+        if self._state == ManagerState.DIRTY:
+            if self._strict_mode:
+                raise ManagerNotResetError(
+                    "Manager state is dirty. Call reset() before processing."
+                )
+
+        if self._state == ManagerState.READY:
+            self._state = ManagerState.RUNNING
+
     def mark_dirty(self) -> None:
         """
         Mark manager as needing reset.
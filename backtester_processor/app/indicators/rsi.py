@@ -2,9 +2,10 @@
 Relative Strength Index indicator.
 """
 
-from decimal import Decimal
 from typing import Optional
 
+import numpy as np
+
 from app.indicators.base import Indicator, IndicatorConfig
 
 
@@ -22,16 +23,18 @@ class RSI(Indicator):
     - RSI < 30: Oversold
     """
 
+    __slots__ = ("period", "_prev_price", "_avg_gain", "_avg_loss", "_gains", "_losses")
+
     def __init__(self, period: int = 14):
         super().__init__()
         if period < 1:
             raise ValueError("Period must be >= 1")
         self.period = period
-        self._prev_price: Optional[Decimal] = None
-        self._avg_gain: Optional[Decimal] = None
-        self._avg_loss: Optional[Decimal] = None
-        self._gains: list[Decimal] = []
-        self._losses: list[Decimal] = []
+        self._prev_price: Optional[float] = None
+        self._avg_gain: Optional[float] = None
+        self._avg_loss: Optional[float] = None
+        self._gains: list[float] = []
+        self._losses: list[float] = []
 
     @property
     def config(self) -> IndicatorConfig:
@@ -42,7 +45,7 @@ class RSI(Indicator):
             is_stateful=True,
         )
 
-    def update(self, price: Decimal) -> Optional[Decimal]:
+    def _update(self, price: float) -> Optional[float]:
         self._samples_processed += 1
 
         if self._prev_price is None:
@@ -53,8 +56,8 @@ class RSI(Indicator):
         change = price - self._prev_price
         self._prev_price = price
 
-        gain = change if change > 0 else Decimal(0)
-        loss = -change if change < 0 else Decimal(0)
+        gain = change if change > 0 else 0.0
+        loss = -change if change < 0 else 0.0
 
         # During warmup: collect gains/losses
         if self._avg_gain is None:
@@ -63,24 +66,84 @@ class RSI(Indicator):
 
             if len(self._gains) >= self.period:
                 # Initialize with simple average
-                self._avg_gain = sum(self._gains) / Decimal(self.period)
-                self._avg_loss = sum(self._losses) / Decimal(self.period)
-                self._current_value = self._calculate_rsi()
+                self._avg_gain = sum(self._gains) / self.period
+                self._avg_loss = sum(self._losses) / self.period
+                self._current_value = self._calculate_rsi(self._avg_gain, self._avg_loss)
             return self._current_value
 
         # After warmup: use smoothed averages (Wilder's smoothing)
-        self._avg_gain = (self._avg_gain * Decimal(self.period - 1) + gain) / Decimal(self.period)
-        self._avg_loss = (self._avg_loss * Decimal(self.period - 1) + loss) / Decimal(self.period)
+        self._avg_gain = (self._avg_gain * (self.period - 1) + gain) / self.period
+        self._avg_loss = (self._avg_loss * (self.period - 1) + loss) / self.period
 
-        self._current_value = self._calculate_rsi()
+        self._current_value = self._calculate_rsi(self._avg_gain, self._avg_loss)
         return self._current_value
 
-    def _calculate_rsi(self) -> Decimal:
-        if self._avg_loss == Decimal(0):
-            return Decimal(100)  # No losses = max RSI
-
-        rs = self._avg_gain / self._avg_loss
-        return Decimal(100) - (Decimal(100) / (Decimal(1) + rs))
+    def compute(self, prices: np.ndarray) -> np.ndarray:
+        self._decimal_output = False
+        values = np.asarray(prices, dtype=np.float64)
+        n = len(values)
+        out = np.full(n, np.nan)
+        if n == 0:
+            return out
+        period = self.period
+
+        # Price changes, continuing from the last price seen. Without one,
+        # the first row only sets the previous price.
+        if self._prev_price is None:
+            changes = np.diff(values)
+            first = 1
+        else:
+            changes = np.diff(values, prepend=self._prev_price)
+            first = 0
+        self._prev_price = float(values[-1])
+        self._samples_processed += n
+        gains = np.where(changes > 0, changes, 0.0).tolist()
+        losses = np.where(changes < 0, -changes, 0.0).tolist()
+
+        # During warmup: collect gains/losses for the initial simple average
+        k = 0
+        avg_gain = self._avg_gain
+        avg_loss = self._avg_loss
+        while avg_gain is None and k < len(gains):
+            self._gains.append(gains[k])
+            self._losses.append(losses[k])
+            k += 1
+            if len(self._gains) >= period:
+                avg_gain = sum(self._gains) / period
+                avg_loss = sum(self._losses) / period
+        if avg_gain is None:
+            return out
+
+        # Wilder's smoothing is sequential; the RSI formula is then applied
+        # to all rows at once. Same float operations as _update().
+        start = k - 1 if self._avg_gain is None else k
+        avg_gains = [avg_gain] if start < k else []
+        avg_losses = [avg_loss] if start < k else []
+        for gain, loss in zip(gains[k:], losses[k:]):
+            avg_gain = (avg_gain * (period - 1) + gain) / period
+            avg_loss = (avg_loss * (period - 1) + loss) / period
+            avg_gains.append(avg_gain)
+            avg_losses.append(avg_loss)
+        self._avg_gain = avg_gain
+        self._avg_loss = avg_loss
+
+        if avg_gains:
+            gain_values = np.array(avg_gains)
+            loss_values = np.array(avg_losses)
+            with np.errstate(divide="ignore", invalid="ignore"):
+                rsi = 100.0 - (100.0 / (1.0 + gain_values / loss_values))
+            rsi[loss_values == 0] = 100.0  # No losses = max RSI
+            out[first + start:] = rsi
+            self._current_value = float(rsi[-1])
+        return out
+
+    @staticmethod
+    def _calculate_rsi(avg_gain: float, avg_loss: float) -> float:
+        if avg_loss == 0:
+            return 100.0  # No losses = max RSI
+
+        rs = avg_gain / avg_loss
+        return 100.0 - (100.0 / (1.0 + rs))
 
     def _reset_state(self) -> None:
         self._prev_price = None
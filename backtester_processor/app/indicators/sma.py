@@ -3,10 +3,11 @@ Simple Moving Average indicator.
 """
 
 from collections import deque
-from decimal import Decimal
 from typing import Optional
 
-from app.indicators.base import Indicator, IndicatorConfig
+import numpy as np
+
+from app.indicators.base import Indicator, IndicatorConfig, _trailing_windows
 
 
 class SMA(Indicator):
@@ -17,12 +18,14 @@ class SMA(Indicator):
     Safe to use as soon as warmup period is reached.
     """
 
+    __slots__ = ("period", "_window")
+
     def __init__(self, period: int = 20):
         super().__init__()
         if period < 1:
             raise ValueError("Period must be >= 1")
         self.period = period
-        self._window: deque[Decimal] = deque(maxlen=period)
+        self._window: deque[float] = deque(maxlen=period)
 
     @property
     def config(self) -> IndicatorConfig:
@@ -33,15 +36,29 @@ class SMA(Indicator):
             is_stateful=False,
         )
 
-    def update(self, price: Decimal) -> Optional[Decimal]:
+    def _update(self, price: float) -> Optional[float]:
         self._window.append(price)
         self._samples_processed += 1
 
         if not self.is_ready:
             return None
 
-        self._current_value = sum(self._window) / Decimal(len(self._window))
+        self._current_value = sum(self._window) / len(self._window)
         return self._current_value
 
+    def compute(self, prices: np.ndarray) -> np.ndarray:
+        self._decimal_output = False
+        prices = np.asarray(prices, dtype=np.float64)
+        out = np.full(len(prices), np.nan)
+
+        windows, first = _trailing_windows(self._window, prices, self.period)
+        out[first:] = windows.sum(axis=1) / self.period
+
+        self._window.extend(prices[-self.period:].tolist())
+        self._samples_processed += len(prices)
+        if len(prices) and self.is_ready:
+            self._current_value = float(out[-1])
+        return out
+
     def _reset_state(self) -> None:
         self._window.clear()
@@ -3,12 +3,13 @@ Repository for Polymarket database operations.
 Handles creating tables and inserting trade data.
 """
 
+import io
 import os
 from typing import Optional
 from contextlib import contextmanager
 
 import psycopg2
-from psycopg2.extras import execute_values
+from psycopg2.extras import execute_values, RealDictCursor
 
 
 import re
@@ -24,6 +25,73 @@ def get_table_name(clob_token_id: str) -> str:
     return f"hist_trades_{get_table_suffix(clob_token_id)}"
 
 
+# Columns written by insert_trades() / copy_trades(), in _trade_row() order
+TRADE_COLUMNS = [
+    "tx_hash",
+    "block_number",
+    "block_time",
+    "maker",
+    "taker",
+    "maker_asset_id",
+    "taker_asset_id",
+    "maker_amount_filled",
+    "taker_amount_filled",
+    "fee",
+    "side",
+    "price",
+]
+
+
+# Columns get_trades() may order by
+TRADE_ORDER_COLUMNS = {"id", "block_time", "block_number", "price"}
+
+
+# Non-unique indexes created by create_hist_trades_table(), named idx_<suffix>_<column>
+TRADE_INDEX_COLUMNS = ("block_time", "maker", "taker")
+
+
+def _asset_id(value) -> str:
+    """Asset IDs are stored as strings; missing IDs become empty strings."""
+    if not value:
+        return ""
+    return value if type(value) is str else str(value)
+
+
+def _trade_row(t: dict) -> tuple:
+    """Build an insert tuple for a trade dict, matching TRADE_COLUMNS."""
+    return (
+        t.get("tx_hash"),
+        t.get("block_number"),
+        t.get("block_time"),
+        t.get("maker"),
+        t.get("taker"),
+        _asset_id(t.get("maker_asset_id")),
+        _asset_id(t.get("taker_asset_id")),
+        t.get("maker_amount_filled"),
+        t.get("taker_amount_filled"),
+        t.get("fee"),
+        t.get("side"),
+        t.get("price"),
+    )
+
+
+def _copy_value(value) -> str:
+    """Format a value for COPY text format (NULL is \\N)."""
+    if value is None:
+        return "\\N"
+    return (
+        str(value)
+        .replace("\\", "\\\\")
+        .replace("\t", "\\t")
+        .replace("\n", "\\n")
+        .replace("\r", "\\r")
+    )
+
+
+# Continuous market slug: anything-followed-by-a-number at the end
+CONTINUOUS_SLUG_PATTERN = re.compile(r'^(.+)-(\d+)$')
+
+
 def parse_continuous_slug(market_slug: str) -> tuple[str, int] | None:
     """
     Parse a continuous market slug to extract category prefix and timestamp.
@@ -35,8 +103,7 @@ def parse_continuous_slug(market_slug: str) -> tuple[str, int] | None:
     if not market_slug:
         return None
 
-    # Match pattern: anything-followed-by-a-number at the end
-    match = re.match(r'^(.+)-(\d+)$', market_slug)
+    match = CONTINUOUS_SLUG_PATTERN.match(market_slug)
     if match:
         prefix = match.group(1)
         timestamp = int(match.group(2))
@@ -52,8 +119,25 @@ class PolymarketRepository:
         if not self.database_url:
             raise ValueError("DATABASE_URL not set in environment")
         self._table_name_cache = {}  # Cache for table name lookups
+        self._table_name_cache_warm = False
         self._init_db()
 
+    def _warm_table_name_cache(self) -> None:
+        """
+        Load every (clob_token_id, yes_token_id) mapping in a single query.
+        Avoids one SELECT per market when the cache is cold (e.g. bulk inserts).
+        """
+        with self.get_connection() as conn:
+            with conn.cursor() as cur:
+                cur.execute("SELECT clob_token_id, yes_token_id FROM hist_markets")
+                for clob_token_id, yes_token_id in cur.fetchall():
+                    if yes_token_id:
+                        table_name = f"hist_trades_{yes_token_id[:15]}"
+                    else:
+                        table_name = get_table_name(clob_token_id)
+                    self._table_name_cache.setdefault(clob_token_id, table_name)
+        self._table_name_cache_warm = True
+
     def get_table_name_for_market(self, clob_token_id: str) -> str:
         """
         Get table name using YES token ID from hist_markets.
@@ -63,6 +147,13 @@ class PolymarketRepository:
         if clob_token_id in self._table_name_cache:
             return self._table_name_cache[clob_token_id]
 
+        # Warm the whole cache on the first miss
+        if not self._table_name_cache_warm:
+            self._warm_table_name_cache()
+            if clob_token_id in self._table_name_cache:
+                return self._table_name_cache[clob_token_id]
+
+        # Market registered after warm-up: look it up individually
         with self.get_connection() as conn:
             with conn.cursor() as cur:
                 cur.execute("""
@@ -262,7 +353,7 @@ class PolymarketRepository:
             List of subtopic dicts with id, name, subtopic, continuous, created_at
         """
         with self.get_connection() as conn:
-            with conn.cursor() as cur:
+            with conn.cursor(cursor_factory=RealDictCursor) as cur:
                 cur.execute(
                     """
                     SELECT t.id, t.name, t.subtopic, t.continuous, t.created_at
@@ -275,8 +366,7 @@ class PolymarketRepository:
                     """,
                     (name,)
                 )
-                columns = [desc[0] for desc in cur.description]
-                return [dict(zip(columns, row)) for row in cur.fetchall()]
+                return cur.fetchall()
 
     def get_topics(self) -> list[dict]:
         """
@@ -285,39 +375,28 @@ class PolymarketRepository:
         Only includes topics that have at least one market.
         """
         with self.get_connection() as conn:
-            with conn.cursor() as cur:
+            with conn.cursor(cursor_factory=RealDictCursor) as cur:
                 cur.execute(
                     """
-                    WITH topic_market_counts AS (
-                        SELECT
-                            t.name,
-                            t.subtopic,
-                            t.continuous,
-                            t.created_at,
-                            COUNT(m.clob_token_id) as market_count
-                        FROM topics t
-                        LEFT JOIN hist_markets m ON t.id = m.topic_id
-                        GROUP BY t.name, t.subtopic, t.continuous, t.created_at
+                    WITH market_counts AS (
+                        SELECT topic_id, COUNT(*) as market_count
+                        FROM hist_markets
+                        WHERE topic_id IS NOT NULL
+                        GROUP BY topic_id
                     )
-                    SELECT DISTINCT ON (name)
-                           name,
-                           bool_or(continuous) OVER (PARTITION BY name) as continuous,
-                           MIN(created_at) OVER (PARTITION BY name) as created_at,
-                           COUNT(*) FILTER (WHERE subtopic IS NOT NULL AND market_count > 0) OVER (PARTITION BY name) as subtopic_count,
-                           SUM(market_count) OVER (PARTITION BY name) as total_markets
-                    FROM topic_market_counts
-                    WHERE market_count > 0 OR name IN (
-                        SELECT DISTINCT name
-                        FROM topic_market_counts
-                        WHERE market_count > 0
-                    )
-                    ORDER BY name, created_at
+                    SELECT t.name,
+                           bool_or(t.continuous) as continuous,
+                           MIN(t.created_at) as created_at,
+                           COUNT(*) FILTER (WHERE t.subtopic IS NOT NULL AND mc.market_count > 0) as subtopic_count,
+                           COALESCE(SUM(mc.market_count), 0) as total_markets
+                    FROM topics t
+                    LEFT JOIN market_counts mc ON mc.topic_id = t.id
+                    GROUP BY t.name
+                    HAVING COALESCE(SUM(mc.market_count), 0) > 0
+                    ORDER BY t.name
                     """
                 )
-                columns = [desc[0] for desc in cur.description]
-                results = [dict(zip(columns, row)) for row in cur.fetchall()]
-                # Filter to only include topics that have at least one market
-                return [r for r in results if r['total_markets'] > 0]
+                return cur.fetchall()
 
     def get_topic_date_ranges(self) -> dict[str, dict]:
         """
@@ -373,7 +452,7 @@ class PolymarketRepository:
             Topic dict or None if not found
         """
         with self.get_connection() as conn:
-            with conn.cursor() as cur:
+            with conn.cursor(cursor_factory=RealDictCursor) as cur:
                 if subtopic is not None:
                     cur.execute(
                         """
@@ -392,11 +471,7 @@ class PolymarketRepository:
                         """,
                         (name,)
                     )
-                result = cur.fetchone()
-                if result:
-                    columns = [desc[0] for desc in cur.description]
-                    return dict(zip(columns, result))
-                return None
+                return cur.fetchone()
 
     # ==================== MARKETS ====================
 
@@ -446,6 +521,9 @@ class PolymarketRepository:
                     (clob_token_id, market_slug, question, neg, topic_id),
                 )
 
+        # Mapping may have changed; resolve again on next lookup
+        self._table_name_cache.pop(clob_token_id, None)
+
     def add_market(
         self,
         clob_token_id: str,
@@ -476,7 +554,7 @@ class PolymarketRepository:
     def get_indexed_markets(self) -> list[dict]:
         """Get all indexed markets with their topic names and subtopics."""
         with self.get_connection() as conn:
-            with conn.cursor() as cur:
+            with conn.cursor(cursor_factory=RealDictCursor) as cur:
                 cur.execute(
                     """
                     SELECT m.clob_token_id, m.market_slug, m.question, m.neg, t.name as topic, t.subtopic
@@ -484,8 +562,7 @@ class PolymarketRepository:
                     LEFT JOIN topics t ON m.topic_id = t.id
                     """
                 )
-                columns = [desc[0] for desc in cur.description]
-                return [dict(zip(columns, row)) for row in cur.fetchall()]
+                return cur.fetchall()
 
     def get_markets_by_topic(self, topic: str, subtopic: Optional[str] = None) -> list[dict]:
         """
@@ -499,7 +576,7 @@ class PolymarketRepository:
             List of market dicts
         """
         with self.get_connection() as conn:
-            with conn.cursor() as cur:
+            with conn.cursor(cursor_factory=RealDictCursor) as cur:
                 if subtopic is not None:
                     cur.execute(
                         """
@@ -522,8 +599,7 @@ class PolymarketRepository:
                         """,
                         (topic,),
                     )
-                columns = [desc[0] for desc in cur.description]
-                return [dict(zip(columns, row)) for row in cur.fetchall()]
+                return cur.fetchall()
 
     def get_continuous_markets_by_topic(
         self,
@@ -566,7 +642,7 @@ class PolymarketRepository:
     def get_market_info(self, clob_token_id: str) -> Optional[dict]:
         """Get market info including topic details and subtopic."""
         with self.get_connection() as conn:
-            with conn.cursor() as cur:
+            with conn.cursor(cursor_factory=RealDictCursor) as cur:
                 cur.execute(
                     """
                     SELECT m.clob_token_id, m.market_slug, m.question, m.neg,
@@ -577,11 +653,7 @@ class PolymarketRepository:
                     """,
                     (clob_token_id,),
                 )
-                result = cur.fetchone()
-                if result:
-                    columns = [desc[0] for desc in cur.description]
-                    return dict(zip(columns, result))
-                return None
+                return cur.fetchone()
 
     def get_continuous_markets_by_category(
         self,
@@ -610,7 +682,7 @@ class PolymarketRepository:
         prefix, _ = parsed
 
         with self.get_connection() as conn:
-            with conn.cursor() as cur:
+            with conn.cursor(cursor_factory=RealDictCursor) as cur:
                 # Get all markets matching the prefix pattern
                 cur.execute(
                     """
@@ -623,8 +695,7 @@ class PolymarketRepository:
                     """,
                     (f"{prefix}-%",),
                 )
-                columns = [desc[0] for desc in cur.description]
-                all_markets = [dict(zip(columns, row)) for row in cur.fetchall()]
+                all_markets = cur.fetchall()
 
         # Parse and sort by timestamp
         markets_with_ts = []
@@ -674,49 +745,106 @@ class PolymarketRepository:
 
         table_name = self.get_table_name_for_market(clob_token_id)
 
-        columns = [
-            "tx_hash",
-            "block_number",
-            "block_time",
-            "maker",
-            "taker",
-            "maker_asset_id",
-            "taker_asset_id",
-            "maker_amount_filled",
-            "taker_amount_filled",
-            "fee",
-            "side",
-            "price",
-        ]
-
-        values = [
-            (
-                t.get("tx_hash"),
-                t.get("block_number"),
-                t.get("block_time"),
-                t.get("maker"),
-                t.get("taker"),
-                str(t.get("maker_asset_id") or ""),
-                str(t.get("taker_asset_id") or ""),
-                t.get("maker_amount_filled"),
-                t.get("taker_amount_filled"),
-                t.get("fee"),
-                t.get("side"),
-                t.get("price"),
-            )
-            for t in trades
-        ]
+        # execute_values pages through any iterable, no need to build a list
+        values = (_trade_row(t) for t in trades)
 
         with self.get_connection() as conn:
             with conn.cursor() as cur:
                 insert_sql = f"""
-                    INSERT INTO {table_name} ({', '.join(columns)})
+                    INSERT INTO {table_name} ({', '.join(TRADE_COLUMNS)})
                     VALUES %s
                     ON CONFLICT (tx_hash, maker, taker, maker_amount_filled) DO NOTHING
                 """
                 execute_values(cur, insert_sql, values)
                 return cur.rowcount
 
+    def copy_trades(self, clob_token_id: str, trades: list[dict]) -> int:
+        """
+        Bulk insert trades using COPY, for backfills.
+
+        Rows are COPY'd into a temporary staging table (no WAL), dropped when
+        the transaction commits. Only the final INSERT ... SELECT into the
+        market's hist_trades table is logged. Duplicates are skipped as in
+        insert_trades().
+        Returns the number of inserted rows.
+        """
+        if not trades:
+            return 0
+
+        table_name = self.get_table_name_for_market(clob_token_id)
+        stage_name = "trades_stage"
+        columns = ", ".join(TRADE_COLUMNS)
+
+        buf = io.StringIO()
+        for t in trades:
+            buf.write("\t".join(_copy_value(v) for v in _trade_row(t)))
+            buf.write("\n")
+        buf.seek(0)
+
+        with self.get_connection() as conn:
+            with conn.cursor() as cur:
+                cur.execute(f"""
+                    CREATE TEMP TABLE {stage_name} ON COMMIT DROP AS
+                    SELECT {columns} FROM {table_name} WITH NO DATA
+                """)
+                cur.copy_expert(f"COPY {stage_name} ({columns}) FROM STDIN", buf)
+                cur.execute(f"""
+                    INSERT INTO {table_name} ({columns})
+                    SELECT {columns} FROM {stage_name}
+                    ON CONFLICT (tx_hash, maker, taker, maker_amount_filled) DO NOTHING
+                """)
+                return cur.rowcount
+
+    def bulk_load_begin(self, clob_token_id: str) -> None:
+        """
+        Prepare a market's hist_trades table for a bulk backfill.
+
+        Drops the non-unique secondary indexes (block_time, maker, taker) so
+        inserts only maintain the primary key and the UNIQUE constraint used by
+        ON CONFLICT. Queries on the table are slower until bulk_load_end() is
+        called, so only use this while the market is being backfilled.
+        """
+        table_name = self.get_table_name_for_market(clob_token_id)
+        suffix = table_name[len("hist_trades_"):]
+        index_names = ", ".join(f"idx_{suffix}_{col}" for col in TRADE_INDEX_COLUMNS)
+
+        with self.get_connection() as conn:
+            with conn.cursor() as cur:
+                cur.execute(f"DROP INDEX IF EXISTS {index_names}")
+
+    def bulk_load_end(self, clob_token_id: str) -> None:
+        """
+        Recreate the secondary indexes dropped by bulk_load_begin().
+        Uses CREATE INDEX CONCURRENTLY so the table stays writable meanwhile.
+
+        A failed concurrent build leaves an INVALID index behind, which
+        IF NOT EXISTS would keep; such leftovers are dropped and rebuilt.
+        """
+        table_name = self.get_table_name_for_market(clob_token_id)
+        suffix = table_name[len("hist_trades_"):]
+        index_names = [f"idx_{suffix}_{col}" for col in TRADE_INDEX_COLUMNS]
+
+        with self.get_connection() as conn:
+            # CONCURRENTLY cannot run inside a transaction block
+            conn.autocommit = True
+            with conn.cursor() as cur:
+                cur.execute("""
+                    SELECT c.relname
+                    FROM pg_index i
+                    JOIN pg_class c ON c.oid = i.indexrelid
+                    WHERE i.indrelid = %s::regclass
+                      AND NOT i.indisvalid
+                      AND c.relname = ANY(%s)
+                """, (table_name, index_names))
+                for (index_name,) in cur.fetchall():
+                    cur.execute(f"DROP INDEX CONCURRENTLY IF EXISTS {index_name}")
+
+                for col in TRADE_INDEX_COLUMNS:
+                    cur.execute(
+                        f"CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_{suffix}_{col} "
+                        f"ON {table_name}({col})"
+                    )
+
     def get_trades(
         self,
         clob_token_id: str,
@@ -731,28 +859,35 @@ class PolymarketRepository:
         Args:
             clob_token_id: The market identifier
             limit: Max number of trades to return (None for all)
-            offset: Number of trades to skip
-            order_by: Column to order by (default: block_time)
+            offset: Number of trades to skip (only applied together with limit)
+            order_by: Column to order by (default: block_time), one of TRADE_ORDER_COLUMNS
             ascending: Sort order (default: True for oldest first)
 
         Returns:
             List of trade dictionaries
+
+        Raises:
+            ValueError: If order_by is not an allowed column
         """
+        if order_by not in TRADE_ORDER_COLUMNS:
+            raise ValueError(
+                f"Cannot order trades by '{order_by}'. "
+                f"Allowed: {sorted(TRADE_ORDER_COLUMNS)}"
+            )
+
         table_name = self.get_table_name_for_market(clob_token_id)
         order_dir = "ASC" if ascending else "DESC"
 
         with self.get_connection() as conn:
-            with conn.cursor() as cur:
+            with conn.cursor(cursor_factory=RealDictCursor) as cur:
                 query = f"""
                     SELECT id, tx_hash, block_number, block_time, maker, taker,
                            maker_asset_id, taker_asset_id, maker_amount_filled,
                            taker_amount_filled, fee, side, price, created_at
                     FROM {table_name}
                     ORDER BY {order_by} {order_dir}
+                    LIMIT %s OFFSET %s
                 """
-                if limit is not None:
-                    query += f" LIMIT {limit} OFFSET {offset}"
-
-                cur.execute(query)
-                columns = [desc[0] for desc in cur.description]
-                return [dict(zip(columns, row)) for row in cur.fetchall()]
+                # LIMIT NULL means no limit, so the statement text stays constant
+                cur.execute(query, (limit, offset if limit is not None else 0))
+                return cur.fetchall()
@@ -6,7 +6,7 @@ from decimal import Decimal
 from datetime import datetime
 from typing import Literal, Optional, Union, Any, Annotated
 
-from pydantic import BaseModel, Field, model_validator, field_validator, ConfigDict
+from pydantic import BaseModel, Field, model_validator, field_validator, ConfigDict, TypeAdapter, PlainSerializer
 
 
 # Strategy Configuration Models
@@ -26,6 +26,10 @@ class GridStrategyConfig(BaseModel):
                     "Protects against markets going to 0."
     )
 
+    def to_factory_dict(self) -> dict:
+        """Shallow field dict for create_strategy(); cheaper than model_dump()."""
+        return dict(self.__dict__)
+
 
 class MomentumStrategyConfig(BaseModel):
     """Configuration for Momentum trading strategy."""
@@ -35,6 +39,10 @@ class MomentumStrategyConfig(BaseModel):
     order_size: Decimal = Field(default=Decimal("100"), gt=0, description="Size of each order")
     initial_balance: Decimal = Field(default=Decimal("10000"), gt=0, description="Starting balance")
 
+    def to_factory_dict(self) -> dict:
+        """Shallow field dict for create_strategy(); cheaper than model_dump()."""
+        return dict(self.__dict__)
+
 
 # Custom Strategy Configuration Models
 class IndicatorConfig(BaseModel):
@@ -94,6 +102,22 @@ class CustomStrategyConfig(BaseModel):
             return Decimal("10000")
         return v
 
+    def to_factory_dict(self) -> dict:
+        """Field dict for create_strategy(), with nested indicator/rule models as dicts."""
+        data = dict(self.__dict__)
+        data["indicators"] = [dict(ind.__dict__) for ind in self.indicators]
+        data["buy_rules"] = [_rule_to_dict(rule) for rule in self.buy_rules]
+        data["sell_rules"] = [_rule_to_dict(rule) for rule in self.sell_rules]
+        return data
+
+
+def _rule_to_dict(rule: TradingRule) -> dict:
+    """TradingRule as a plain dict, matching model_dump() output."""
+    data = dict(rule.__dict__)
+    if rule.conditions is not None:
+        data["conditions"] = [dict(cond.__dict__) for cond in rule.conditions]
+    return data
+
 
 StrategyConfig = Annotated[
     Union[GridStrategyConfig, MomentumStrategyConfig, CustomStrategyConfig],
@@ -109,6 +133,9 @@ class BacktestRequest(BaseModel):
     For single-market backtest: provide clob_token_id
     For continuous market backtest: provide topic + amount_of_markets
     """
+    # Built eagerly so schema problems show up at import, not on first request
+    model_config = ConfigDict(defer_build=False)
+
     clob_token_id: Optional[str] = Field(
         default=None,
         min_length=1,
@@ -144,28 +171,44 @@ class BacktestRequest(BaseModel):
         return self
 
 
+# Reusable validator for requests arriving outside FastAPI (scripts, workers).
+# StrategyConfig's Field(discriminator=...) compiles to a tagged union, so the
+# strategy variant is picked by strategy_type without trying each model.
+REQUEST_ADAPTER: TypeAdapter[BacktestRequest] = TypeAdapter(BacktestRequest)
+
+
 # Response Models
+# Validators/serializers are built on first use rather than at import.
+
+# Decimal amounts are sent as strings to keep full precision in JSON
+DecimalStr = Annotated[Decimal, PlainSerializer(str, return_type=str)]
+
+
 class TradeRecord(BaseModel):
     """Record of an executed trade."""
+    model_config = ConfigDict(defer_build=True)
+
     side: str
-    price: str
-    size: str
+    price: DecimalStr
+    size: DecimalStr
     timestamp: datetime
-    pnl: str
+    pnl: DecimalStr
 
 
 class BacktestStatisticsResponse(BaseModel):
     """Backtest statistics response."""
+    model_config = ConfigDict(defer_build=True)
+
     strategy_name: str
-    initial_balance: str
-    final_equity: str
-    total_pnl: str
+    initial_balance: DecimalStr
+    final_equity: DecimalStr
+    total_pnl: DecimalStr
     total_return_pct: float
     total_trades: int
     winning_trades: int
     losing_trades: int
     win_rate: float
-    max_drawdown: str
+    max_drawdown: DecimalStr
     max_drawdown_pct: float
     sharpe_ratio: Optional[float]
     trades: list[TradeRecord]
@@ -173,6 +216,8 @@ class BacktestStatisticsResponse(BaseModel):
 
 class BacktestResponse(BaseModel):
     """Response model for backtest results."""
+    model_config = ConfigDict(defer_build=True)
+
     success: bool
     statistics: BacktestStatisticsResponse
     dataframe: list[dict[str, Any]]
@@ -182,12 +227,16 @@ class BacktestResponse(BaseModel):
 
 class HealthResponse(BaseModel):
     """Health check response."""
+    model_config = ConfigDict(defer_build=True)
+
     status: str
     version: str
 
 
 class ErrorResponse(BaseModel):
     """Error response model."""
+    model_config = ConfigDict(defer_build=True)
+
     detail: str
     error_code: Optional[str] = None
 
@@ -218,12 +267,16 @@ class SubtopicInfo(BaseModel):
 
 class TopicsResponse(BaseModel):
     """Response model for topics list."""
+    model_config = ConfigDict(defer_build=True)
+
     topics: list[Topic]
     count: int
 
 
 class SubtopicsResponse(BaseModel):
     """Response model for subtopics list."""
+    model_config = ConfigDict(defer_build=True)
+
     topic: str
     subtopics: list[SubtopicInfo]
     count: int
@@ -231,6 +284,8 @@ class SubtopicsResponse(BaseModel):
 
 class MarketInfo(BaseModel):
     """Market information."""
+    model_config = ConfigDict(defer_build=True)
+
     clob_token_id: str
     market_slug: Optional[str]
     question: Optional[str]
@@ -241,5 +296,7 @@ class MarketInfo(BaseModel):
 
 class MarketsResponse(BaseModel):
     """Response model for markets list."""
+    model_config = ConfigDict(defer_build=True)
+
     markets: list[MarketInfo]
     count: int
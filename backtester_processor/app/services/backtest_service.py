@@ -2,6 +2,14 @@
 Business logic service for running backtests.
 """
 
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from typing import Optional
+
+import pandas as pd
+
 from app.config import settings
 from app.core.backtester import Backtester, BacktestResult
 from app.core.exceptions import (
@@ -17,12 +25,48 @@ from app.schemas.backtest import (
     BacktestResponse,
     BacktestStatisticsResponse,
     TradeRecord,
-    GridStrategyConfig,
-    MomentumStrategyConfig,
-    CustomStrategyConfig,
 )
 from app.utils.data import format_trades
-from app.utils.serialization import serialize_dataframe, decimal_to_str
+from app.utils.serialization import serialize_dataframe
+
+
+class _TradeFrameCache:
+    """
+    Small thread-safe LRU cache of formatted trade DataFrames.
+
+    Historical trades only change when new ones are indexed, so entries expire
+    after a TTL instead of being invalidated. Cached frames are shared and
+    must not be modified in place.
+    """
+
+    def __init__(self, maxsize: int, ttl_seconds: float):
+        self._maxsize = maxsize
+        self._ttl = ttl_seconds
+        self._entries: OrderedDict[tuple, tuple[float, pd.DataFrame]] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: tuple) -> Optional[pd.DataFrame]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            stored_at, df = entry
+            if time.monotonic() - stored_at > self._ttl:
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return df
+
+    def put(self, key: tuple, df: pd.DataFrame) -> None:
+        with self._lock:
+            self._entries[key] = (time.monotonic(), df)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self._maxsize:
+                self._entries.popitem(last=False)
+
+
+# Shared across requests (a BacktestService is created per request)
+_trades_cache = _TradeFrameCache(settings.trades_cache_size, settings.trades_cache_ttl_seconds)
 
 
 class BacktestService:
@@ -61,19 +105,13 @@ class BacktestService:
             raise MarketNotFoundError(f"Market {request.clob_token_id} not found")
 
         # Standard single-market backtest
-        trades = self.repository.get_trades(
-            request.clob_token_id,
-            limit=request.limit,
-        )
+        df = self._load_trades(request.clob_token_id, request.limit)
 
-        if not trades:
+        if df is None:
             raise InsufficientDataError(f"No trades found for market {request.clob_token_id}")
 
-        df = format_trades(trades)
-
         # Create strategy instance
-        strategy_config = self._build_strategy_config(request.strategy)
-        strategy = create_strategy(strategy_config)
+        strategy = create_strategy(request.strategy)
 
         # Run backtest
         backtester = Backtester(fee_rate=request.fee_rate)
@@ -114,17 +152,15 @@ class BacktestService:
                 f"No markets found for topic '{request.topic}'{subtopic_str}"
             )
 
-        # Fetch trade data for each market
-        market_data = []
-        for market in markets:
-            clob_id = market["clob_token_id"]
-            if not self.repository.market_exists(clob_id):
-                continue
-
-            trades = self.repository.get_trades(clob_id, limit=request.limit)
-            if trades:
-                df = format_trades(trades)
-                market_data.append((market.get("market_slug", clob_id), df))
+        # Fetch trade data for all markets in parallel; each fetch is DB-bound
+        # and uses its own connection. map() keeps the markets in order.
+        workers = min(settings.market_fetch_workers, len(markets))
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            fetched = executor.map(
+                lambda market: self._fetch_market_trades(market, request.limit),
+                markets,
+            )
+            market_data = [item for item in fetched if item is not None]
 
         if not market_data:
             subtopic_str = f" (subtopic: {request.subtopic})" if request.subtopic else ""
@@ -133,8 +169,7 @@ class BacktestService:
             )
 
         # Create strategy instance
-        strategy_config = self._build_strategy_config(request.strategy)
-        strategy = create_strategy(strategy_config)
+        strategy = create_strategy(request.strategy)
 
         # Run continuous backtest
         backtester = Backtester(fee_rate=request.fee_rate)
@@ -143,38 +178,70 @@ class BacktestService:
         # Build response
         return self._build_response(result)
 
-    def _build_strategy_config(self, strategy: GridStrategyConfig | MomentumStrategyConfig | CustomStrategyConfig) -> dict:
-        """Convert Pydantic strategy config to dict for factory."""
-        return strategy.model_dump()
+    def _fetch_market_trades(
+        self, market: dict, limit: Optional[int]
+    ) -> Optional[tuple[str, pd.DataFrame]]:
+        """
+        Load and format one market's trades for a continuous backtest.
+
+        Markets come from hist_markets already, so there is no separate
+        market_exists() round trip. Returns None if the market has no trades.
+        """
+        clob_id = market["clob_token_id"]
+        df = self._load_trades(clob_id, limit)
+        if df is None:
+            return None
+        return market.get("market_slug", clob_id), df
+
+    def _load_trades(self, clob_token_id: str, limit: Optional[int]) -> Optional[pd.DataFrame]:
+        """Formatted trades for a market, from the shared cache when possible. None if no trades."""
+        key = (clob_token_id, limit)
+        df = _trades_cache.get(key)
+        if df is not None:
+            return df
+
+        trades = self.repository.get_trades(clob_token_id, limit=limit)
+        if not trades:
+            return None
+
+        df = format_trades(trades)
+        _trades_cache.put(key, df)
+        return df
 
     def _build_response(self, result: BacktestResult) -> BacktestResponse:
         """Build API response from backtest result."""
         stats = result.statistics
 
-        # Convert trades to response format
+        # Everything below comes from our own BacktestResult with the field
+        # types already matching the response models, so skip validation.
+        # Decimals are converted to strings by the models' serializer.
+
+        # Convert trades to response format, timestamps in one batch
+        trades = stats.trades
+        timestamps = pd.DatetimeIndex([t.timestamp for t in trades]).to_pydatetime()
         trade_records = [
-            TradeRecord(
+            TradeRecord.model_construct(
                 side=t.side,
-                price=decimal_to_str(t.price),
-                size=decimal_to_str(t.size),
-                timestamp=t.timestamp.to_pydatetime(),
-                pnl=decimal_to_str(t.pnl),
+                price=t.price,
+                size=t.size,
+                timestamp=timestamp,
+                pnl=t.pnl,
             )
-            for t in stats.trades
+            for t, timestamp in zip(trades, timestamps)
         ]
 
         # Build statistics response
-        statistics_response = BacktestStatisticsResponse(
+        statistics_response = BacktestStatisticsResponse.model_construct(
             strategy_name=stats.strategy_name,
-            initial_balance=decimal_to_str(stats.initial_balance),
-            final_equity=decimal_to_str(stats.final_equity),
-            total_pnl=decimal_to_str(stats.total_pnl),
+            initial_balance=stats.initial_balance,
+            final_equity=stats.final_equity,
+            total_pnl=stats.total_pnl,
             total_return_pct=stats.total_return_pct,
             total_trades=stats.total_trades,
             winning_trades=stats.winning_trades,
             losing_trades=stats.losing_trades,
             win_rate=stats.win_rate,
-            max_drawdown=decimal_to_str(stats.max_drawdown),
+            max_drawdown=stats.max_drawdown,
             max_drawdown_pct=stats.max_drawdown_pct,
             sharpe_ratio=stats.sharpe_ratio,
             trades=trade_records,
@@ -183,7 +250,7 @@ class BacktestService:
         # Serialize dataframe
         df_serialized = serialize_dataframe(result.dataframe)
 
-        return BacktestResponse(
+        return BacktestResponse.model_construct(
             success=True,
             statistics=statistics_response,
             dataframe=df_serialized,
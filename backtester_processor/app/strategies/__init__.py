@@ -1,5 +1,24 @@
-from app.strategies.grid_strategy import GridStrategy
-from app.strategies.momentum_strategy import MomentumStrategy
-from app.strategies.custom_strategy import CustomStrategy
+import importlib
 
 __all__ = ["GridStrategy", "MomentumStrategy", "CustomStrategy"]
+
+# Strategy classes are imported on first access so that using one strategy
+# doesn't pull in the others (CustomStrategy brings in all indicators).
+_LAZY_IMPORTS = {
+    "GridStrategy": "app.strategies.grid_strategy",
+    "MomentumStrategy": "app.strategies.momentum_strategy",
+    "CustomStrategy": "app.strategies.custom_strategy",
+}
+
+
+def __getattr__(name: str):
+    module = _LAZY_IMPORTS.get(name)
+    if module is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(module), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__() -> list[str]:
+    return sorted(list(globals()) + __all__)
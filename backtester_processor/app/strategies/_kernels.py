@@ -0,0 +1,49 @@
+"""
+Numeric kernels for strategy signal generation.
+
+Kernels are compiled with numba when it is installed and run as plain
+Python otherwise, so numba stays an optional dependency.
+"""
+
+import numpy as np
+
+try:
+    from numba import njit
+except ImportError:  # pragma: no cover - depends on environment
+
+    def njit(*args, **kwargs):
+        """No-op stand-in for numba.njit."""
+        if len(args) == 1 and callable(args[0]) and not kwargs:
+            return args[0]
+        return lambda func: func
+
+
+# momentum_signals() value for rows too close to the threshold to call in float
+MOMENTUM_RECHECK = 2
+
+
+@njit(cache=True, error_model="numpy")
+def momentum_signals(
+    prices: np.ndarray, lag: int, threshold: float, tolerance: float
+) -> np.ndarray:
+    """
+    Momentum signal for every row of a price series.
+
+    Row i compares prices[i] with prices[i - lag]. Returns int8 signals:
+    1 where momentum > threshold, -1 where momentum < -threshold, else 0.
+    Rows without enough history are 0. Rows whose momentum is within
+    tolerance of +/-threshold are MOMENTUM_RECHECK, since float rounding
+    could decide them either way; the caller resolves those exactly.
+    """
+    n = prices.shape[0]
+    out = np.zeros(n, dtype=np.int8)
+    for i in range(lag, n):
+        lookback = prices[i - lag]
+        momentum = (prices[i] - lookback) / lookback
+        if abs(abs(momentum) - threshold) <= tolerance:
+            out[i] = MOMENTUM_RECHECK
+        elif momentum > threshold:
+            out[i] = 1
+        elif momentum < -threshold:
+            out[i] = -1
+    return out
@@ -5,13 +5,16 @@ This strategy allows users to combine indicators (EMA, RSI, MACD, etc.)
 and define simple trading rules without writing code.
 """
 
+import copy
 from decimal import Decimal
-from typing import Optional
-from dataclasses import dataclass
+from typing import Callable, Optional
+from dataclasses import dataclass, field
 from enum import Enum
+import numpy as np
 import pandas as pd
 
 from app.core.strategy import Strategy, Order
+from app.utils.data import to_decimal_price
 from app.indicators import (
     IndicatorManager,
     SMA,
@@ -32,7 +35,39 @@ class ConditionOperator(str, Enum):
     CROSS_BELOW = "cross_below"  # value crosses below threshold
 
 
-@dataclass
+# Integer tags for ConditionOperator, compared with plain int equality
+_OP_GT, _OP_LT, _OP_GTE, _OP_LTE, _OP_CROSS_ABOVE, _OP_CROSS_BELOW = range(6)
+
+_OPERATOR_TAGS = {
+    ConditionOperator.GT: _OP_GT,
+    ConditionOperator.LT: _OP_LT,
+    ConditionOperator.GTE: _OP_GTE,
+    ConditionOperator.LTE: _OP_LTE,
+    ConditionOperator.CROSS_ABOVE: _OP_CROSS_ABOVE,
+    ConditionOperator.CROSS_BELOW: _OP_CROSS_BELOW,
+}
+
+# Indicators run on floats, so a value that equals a rule's fixed value in
+# exact arithmetic can miss it by rounding (an SMA of 0.1, 0.2, 0.3 is
+# 0.20000000000000004). Values this close to it, relative to the fixed
+# value but at least absolute, compare as equal.
+_VALUE_TOLERANCE = 1e-9
+
+
+def _fixed_compare_value(operator_tag: int, value: float) -> float:
+    """
+    Shift a rule's fixed value by _VALUE_TOLERANCE for its operator.
+
+    Strict comparisons must clear the tolerance and inclusive ones may fall
+    short of it, so both treat near-equal indicator values as equal.
+    """
+    slack = _VALUE_TOLERANCE * max(1.0, abs(value))
+    if operator_tag in (_OP_GT, _OP_LTE, _OP_CROSS_ABOVE):
+        return value + slack
+    return value - slack
+
+
+@dataclass(slots=True, frozen=True)
 class IndicatorCondition:
     """
     A single condition that must be met for a signal.
@@ -45,15 +80,18 @@ class IndicatorCondition:
     indicator_name: str  # Name of indicator (or "price")
     operator: ConditionOperator
     # Can compare to a fixed value OR another indicator
-    compare_to_value: Optional[Decimal] = None
+    compare_to_value: Optional[float] = None
     compare_to_indicator: Optional[str] = None
+    operator_tag: int = field(init=False, repr=False, compare=False)
 
     def __post_init__(self):
         if self.compare_to_value is None and self.compare_to_indicator is None:
             raise ValueError("Must specify either compare_to_value or compare_to_indicator")
+        # Derived field on a frozen dataclass
+        object.__setattr__(self, "operator_tag", _OPERATOR_TAGS[ConditionOperator(self.operator)])
 
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class SignalRule:
     """
     A trading signal rule combining multiple conditions.
@@ -134,9 +172,43 @@ class CustomStrategy(Strategy):
         # Parse trading rules
         self.buy_rules = self._parse_rules(buy_rules, "buy")
         self.sell_rules = self._parse_rules(sell_rules, "sell")
-
-        # Track previous values for crossover detection
-        self._prev_values: dict[str, Optional[Decimal]] = {}
+        self._validate_rule_references(self.buy_rules + self.sell_rules)
+        self._compiled_buy = [self._compile_rule(rule) for rule in self.buy_rules]
+        self._compiled_sell = [self._compile_rule(rule) for rule in self.sell_rules]
+        self._has_buy_rules = bool(self.buy_rules)
+        self._has_sell_rules = bool(self.sell_rules)
+
+        # Only build MACD/BB derived values per trade if a rule references one
+        referenced = {
+            name
+            for rule in self.buy_rules + self.sell_rules
+            for cond in rule.conditions
+            for name in (cond.indicator_name, cond.compare_to_indicator)
+        }
+        special_keys = {
+            key for entry in self._macd_indicators + self._bb_indicators for key in entry[:-1]
+        }
+        self._needs_special_values = bool(referenced & special_keys)
+
+        # Track previous values for crossover detection, only for the
+        # values that crossover conditions actually read
+        self._crossover_keys: frozenset[str] = frozenset(
+            name
+            for rule in self.buy_rules + self.sell_rules
+            for cond in rule.conditions
+            if cond.operator_tag in (_OP_CROSS_ABOVE, _OP_CROSS_BELOW)
+            for name in (cond.indicator_name, cond.compare_to_indicator)
+            if name is not None
+        )
+        self._prev_values: dict[str, Optional[float]] = {}
+
+        # Set once all indicators have finished warmup (until the next reset)
+        self._warmed_up: bool = False
+
+        # Per-row signals from prepare(); None means evaluate rules per trade
+        self._buy_signals: Optional[np.ndarray] = None
+        self._sell_signals: Optional[np.ndarray] = None
+        self._signal_pos: int = 0
 
     # Parameters accepted by each indicator type
     INDICATOR_PARAMS = {
@@ -172,16 +244,24 @@ class CustomStrategy(Strategy):
 
             self.manager.add(name, indicator)
 
-        # Handle special cases for composite indicators
-        # MACD has signal and histogram that can be referenced
-        for name, ind in list(self.manager._indicators.items()):
+        # Composite indicators expose extra values that rules can reference,
+        # e.g. "macd_signal" or "bb_upper". Resolve the keys once here.
+        self._macd_indicators: list[tuple[str, str, MACD]] = []
+        self._bb_indicators: list[tuple[str, str, str, str, BollingerBands]] = []
+        for name, ind in self.manager._indicators.items():
             if isinstance(ind, MACD):
-                # Users can reference "macd_signal" and "macd_histogram"
-                pass  # These are accessed via the MACD indicator itself
+                self._macd_indicators.append(
+                    (f"{name}_signal", f"{name}_histogram", ind)
+                )
 
             if isinstance(ind, BollingerBands):
-                # Users can reference "bb_upper", "bb_lower", "bb_middle"
-                pass  # These are accessed via the BB indicator itself
+                self._bb_indicators.append((
+                    f"{name}_upper",
+                    f"{name}_lower",
+                    f"{name}_middle",
+                    f"{name}_bandwidth",
+                    ind,
+                ))
 
     def _parse_rules(self, rules_config: list[dict], signal_type: str) -> list[SignalRule]:
         """Parse rule configurations into SignalRule objects."""
@@ -209,7 +289,7 @@ class CustomStrategy(Strategy):
 
                 # Check for value first (must be non-None)
                 if cond.get("value") is not None:
-                    compare_value = Decimal(str(cond["value"]))
+                    compare_value = float(cond["value"])
                 # Then check for compare_to_indicator (must be non-None/non-empty)
                 elif cond.get("compare_to_indicator"):
                     compare_indicator = cond["compare_to_indicator"]
@@ -231,131 +311,329 @@ class CustomStrategy(Strategy):
 
         return rules
 
+    def _validate_rule_references(self, rules: list[SignalRule]) -> None:
+        """Check that every value a rule reads is price or a configured indicator."""
+        known = {"price", *self.manager._indicators}
+        for entry in self._macd_indicators + self._bb_indicators:
+            known.update(entry[:-1])
+
+        for rule in rules:
+            for cond in rule.conditions:
+                for name in (cond.indicator_name, cond.compare_to_indicator):
+                    if name is not None and name not in known:
+                        raise ValueError(f"Unknown indicator in {rule.signal_type} rule: {name}. "
+                                       f"Available: {sorted(known)}")
+
     def on_start(self) -> None:
         """Reset indicators before backtest starts."""
         self.manager.reset()
         self._prev_values = {}
+        self._warmed_up = False
+        self._buy_signals = None
+        self._sell_signals = None
+        self._signal_pos = 0
+
+    def prepare(self, data: pd.DataFrame) -> None:
+        """
+        Precompute buy/sell signals for every row of a market.
+
+        The indicators run over the whole market on a copy of the manager;
+        on_trade() still updates the live manager once per trade, so it (and
+        get_indicator_status()) never reports values from later rows. Trades
+        past the prepared rows are evaluated per trade.
+        """
+        self.precompute_signals(data["price"].to_numpy(dtype=np.float64))
+
+    def precompute_signals(self, prices: np.ndarray) -> None:
+        """
+        Run the indicators over a price series and evaluate all rules at once.
+
+        Indicator values come from IndicatorManager.compute() as per-name
+        arrays (masked to NaN while not all indicators are ready), then each
+        condition is a vectorized comparison. Conditions are AND'd per rule
+        and rules OR'd, giving one boolean array per side. on_trade() then
+        only looks up the row and checks the position.
+
+        The indicators are computed on a copy of the manager, starting from
+        the live manager's state, which on_trade() then advances per trade.
+        Crossover history carries over between calls, so calling this once
+        per market matches per-trade evaluation.
+        """
+        prices = np.asarray(prices, dtype=np.float64)
+        n = len(prices)
+        series = copy.deepcopy(self.manager).compute(prices)
+        ready = series.all_ready
+
+        # Rules only see values on rows where every indicator is ready
+        columns: dict[str, np.ndarray] = {
+            key: np.where(ready, column, np.nan)
+            for key, column in series.values.items()
+        }
+        columns["price"] = np.where(ready, prices, np.nan)
+
+        # Values from the last ready row before this series, for crossovers on row 0
+        prev_columns: dict[str, np.ndarray] = {}
+        for key in self._crossover_keys:
+            column = columns.get(key)
+            if column is None:
+                continue
+            first = self._prev_values.get(key)
+            prev = np.concatenate(([np.nan if first is None else first], column[:-1]))[:n]
+            prev_columns[key] = prev
+
+        self._buy_signals = self._rule_signals(self.buy_rules, columns, prev_columns, ready)
+        self._sell_signals = self._rule_signals(self.sell_rules, columns, prev_columns, ready)
+        self._signal_pos = 0
+
+        if n > 0 and ready[-1]:
+            self._prev_values = {
+                key: (None if np.isnan(column[-1]) else float(column[-1]))
+                for key, column in columns.items()
+                if key in self._crossover_keys
+            }
+
+    def _rule_signals(
+        self,
+        rules: list[SignalRule],
+        columns: dict[str, np.ndarray],
+        prev_columns: dict[str, np.ndarray],
+        ready: np.ndarray,
+    ) -> np.ndarray:
+        """Vectorized _check_rules(): OR over rules of AND over conditions."""
+        signals = np.zeros(len(ready), dtype=bool)
+        for rule in rules:
+            hit = ready.copy()
+            for cond in rule.conditions:
+                hit &= self._condition_signals(cond, columns, prev_columns)
+            signals |= hit
+        return signals
+
+    def _condition_signals(
+        self,
+        cond: IndicatorCondition,
+        columns: dict[str, np.ndarray],
+        prev_columns: dict[str, np.ndarray],
+    ) -> np.ndarray:
+        """Vectorized single condition check. Missing values (NaN) never match."""
+        n = len(next(iter(columns.values()))) if columns else 0
+        ind_values = columns.get(cond.indicator_name)
+        if cond.compare_to_value is not None:
+            compare_values = _fixed_compare_value(cond.operator_tag, cond.compare_to_value)
+        else:
+            compare_values = columns.get(cond.compare_to_indicator)
+        if ind_values is None or compare_values is None:
+            return np.zeros(n, dtype=bool)
+
+        op = cond.operator_tag
+        if op == _OP_GT:
+            return ind_values > compare_values
+        elif op == _OP_LT:
+            return ind_values < compare_values
+        elif op == _OP_GTE:
+            return ind_values >= compare_values
+        elif op == _OP_LTE:
+            return ind_values <= compare_values
+        elif op == _OP_CROSS_ABOVE:
+            prev_values = prev_columns[cond.indicator_name]
+            return (prev_values <= compare_values) & (ind_values > compare_values)
+        elif op == _OP_CROSS_BELOW:
+            prev_values = prev_columns[cond.indicator_name]
+            return (prev_values >= compare_values) & (ind_values < compare_values)
+
+        return np.zeros(n, dtype=bool)
 
     def on_trade(self, trade_data: pd.Series, historical_data: pd.DataFrame) -> list[Order]:
         """Process trade and generate orders based on indicator rules."""
         orders = []
 
-        current_price = Decimal(str(trade_data["price"]))
+        # Indicators and rule checks run on floats; Decimal is only used for orders
+        current_price = float(trade_data["price"])
+
+        # Signals precomputed by prepare(): only the position check is left
+        if self._buy_signals is not None:
+            i = self._signal_pos
+            if i < len(self._buy_signals):
+                self._signal_pos += 1
+                # Keep the live indicators at the trades seen so far
+                self.manager.update(current_price)
+                if self.state.position is None:
+                    if self._buy_signals[i]:
+                        orders.append(Order(
+                            side="buy",
+                            price=to_decimal_price(current_price),
+                            size=self.order_size,
+                            order_type="market",
+                        ))
+                elif self.state.position.side == "long":
+                    if self._sell_signals[i]:
+                        orders.append(Order(
+                            side="sell",
+                            price=to_decimal_price(current_price),
+                            size=self.order_size,
+                            order_type="market",
+                        ))
+                return orders
+            # Past the rows prepare() saw: the indicators stand at the last of
+            # them, so continue per trade from here
+            self._buy_signals = None
+            self._sell_signals = None
 
         # Update all indicators
         snapshot = self.manager.update(current_price)
 
-        # Wait for all indicators to be ready
-        if not snapshot.all_ready:
+        # Wait for all indicators to be ready; once warmed up they stay ready
+        if not self._warmed_up:
+            if not snapshot.all_ready:
+                return orders
+            self._warmed_up = True
+
+        # Nothing to evaluate or carry forward: no rules for this position state
+        # and no crossover history to keep
+        position = self.state.position
+        if position is None:
+            has_rules = self._has_buy_rules
+        else:
+            has_rules = position.side == "long" and self._has_sell_rules
+        if not has_rules and not self._crossover_keys:
             return orders
 
         # Get current values including price
         current_values = dict(snapshot.values)
         current_values["price"] = current_price
 
-        # Add special indicator values (MACD signal/histogram, BB bands)
-        self._add_special_values(current_values)
+        # Add special indicator values (MACD signal/histogram, BB bands) if any rule uses them
+        if self._needs_special_values:
+            self._add_special_values(current_values)
 
         # Check buy rules (only if not in position)
         if self.state.position is None:
-            if self._check_rules(self.buy_rules, current_values):
+            if self._check_rules(self._compiled_buy, current_values):
                 orders.append(Order(
                     side="buy",
-                    price=current_price,
+                    price=to_decimal_price(current_price),
                     size=self.order_size,
                     order_type="market",
                 ))
 
         # Check sell rules (only if in long position)
         elif self.state.position is not None and self.state.position.side == "long":
-            if self._check_rules(self.sell_rules, current_values):
+            if self._check_rules(self._compiled_sell, current_values):
                 orders.append(Order(
                     side="sell",
-                    price=current_price,
+                    price=to_decimal_price(current_price),
                     size=self.order_size,
                     order_type="market",
                 ))
 
         # Update previous values for next iteration
-        self._prev_values = current_values.copy()
+        if self._crossover_keys:
+            self._prev_values = {
+                k: current_values[k] for k in self._crossover_keys if k in current_values
+            }
 
         return orders
 
     def _add_special_values(self, values: dict) -> None:
         """Add special indicator values (MACD signal, BB bands, etc.)."""
-        for name, indicator in self.manager._indicators.items():
-            if isinstance(indicator, MACD):
-                values[f"{name}_signal"] = indicator.signal
-                values[f"{name}_histogram"] = indicator.histogram
-
-            if isinstance(indicator, BollingerBands):
-                values[f"{name}_upper"] = indicator.upper
-                values[f"{name}_lower"] = indicator.lower
-                values[f"{name}_middle"] = indicator.middle
-                values[f"{name}_bandwidth"] = indicator.bandwidth
-
-    def _check_rules(self, rules: list[SignalRule], values: dict) -> bool:
+        for signal_key, hist_key, macd in self._macd_indicators:
+            values[signal_key] = macd.signal
+            values[hist_key] = macd.histogram
+
+        for upper_key, lower_key, middle_key, bandwidth_key, bb in self._bb_indicators:
+            values[upper_key] = bb.upper
+            values[lower_key] = bb.lower
+            values[middle_key] = bb.middle
+            values[bandwidth_key] = bb.bandwidth
+
+    def _check_rules(self, compiled: list[Callable[[dict], bool]], values: dict) -> bool:
         """
         Check if any rule's conditions are all met.
 
         Rules are OR'd together (any rule can trigger).
         Conditions within a rule are AND'd (all must be true).
         """
-        for rule in rules:
-            if self._check_conditions(rule.conditions, values):
+        for rule in compiled:
+            if rule(values):
                 return True
         return False
 
-    def _check_conditions(self, conditions: list[IndicatorCondition], values: dict) -> bool:
-        """Check if all conditions in a list are met."""
-        for cond in conditions:
-            if not self._check_single_condition(cond, values):
-                return False
-        return True
-
-    def _check_single_condition(self, cond: IndicatorCondition, values: dict) -> bool:
-        """Evaluate a single condition."""
-        # Get the indicator value
-        ind_value = values.get(cond.indicator_name)
-        if ind_value is None:
-            return False
-
-        # Get the comparison value
-        if cond.compare_to_value is not None:
-            compare_value = cond.compare_to_value
-        else:
-            compare_value = values.get(cond.compare_to_indicator)
-            if compare_value is None:
-                return False
-
-        # Evaluate based on operator
-        if cond.operator == ConditionOperator.GT:
-            return ind_value > compare_value
-
-        elif cond.operator == ConditionOperator.LT:
-            return ind_value < compare_value
-
-        elif cond.operator == ConditionOperator.GTE:
-            return ind_value >= compare_value
-
-        elif cond.operator == ConditionOperator.LTE:
-            return ind_value <= compare_value
-
-        elif cond.operator == ConditionOperator.CROSS_ABOVE:
-            prev_value = self._prev_values.get(cond.indicator_name)
-            if prev_value is None:
-                return False
-            # Was below or equal, now above
-            return prev_value <= compare_value and ind_value > compare_value
-
-        elif cond.operator == ConditionOperator.CROSS_BELOW:
-            prev_value = self._prev_values.get(cond.indicator_name)
-            if prev_value is None:
-                return False
-            # Was above or equal, now below
-            return prev_value >= compare_value and ind_value < compare_value
-
-        return False
+    def _compile_rule(self, rule: SignalRule) -> Callable[[dict], bool]:
+        """
+        Build a predicate that is true when all of a rule's conditions are met.
+
+        Conditions are grouped by operator once here, each as a
+        (indicator, compare value or indicator, is_scalar) tuple, so the
+        per-trade check runs one tight loop per operator with no dispatch.
+        Within an operator, comparisons to a fixed value come first since
+        they need one lookup instead of two; the first failing condition
+        ends the check. Fixed values are shifted by _fixed_compare_value().
+        """
+        buckets: list[list[tuple[str, object, bool]]] = [[] for _ in _OPERATOR_TAGS]
+        for cond in rule.conditions:
+            if cond.compare_to_value is not None:
+                compare = _fixed_compare_value(cond.operator_tag, cond.compare_to_value)
+                buckets[cond.operator_tag].append((cond.indicator_name, compare, True))
+            else:
+                buckets[cond.operator_tag].append((cond.indicator_name, cond.compare_to_indicator, False))
+        for bucket in buckets:
+            bucket.sort(key=lambda entry: not entry[2])
+
+        gt = tuple(buckets[_OP_GT])
+        lt = tuple(buckets[_OP_LT])
+        gte = tuple(buckets[_OP_GTE])
+        lte = tuple(buckets[_OP_LTE])
+        cross_above = tuple(buckets[_OP_CROSS_ABOVE])
+        cross_below = tuple(buckets[_OP_CROSS_BELOW])
+        has_crossovers = bool(cross_above or cross_below)
+
+        def check(values: dict) -> bool:
+            get = values.get
+
+            for key, rhs, scalar in gt:
+                value = get(key)
+                compare = rhs if scalar else get(rhs)
+                if value is None or compare is None or not value > compare:
+                    return False
+            for key, rhs, scalar in lt:
+                value = get(key)
+                compare = rhs if scalar else get(rhs)
+                if value is None or compare is None or not value < compare:
+                    return False
+            for key, rhs, scalar in gte:
+                value = get(key)
+                compare = rhs if scalar else get(rhs)
+                if value is None or compare is None or not value >= compare:
+                    return False
+            for key, rhs, scalar in lte:
+                value = get(key)
+                compare = rhs if scalar else get(rhs)
+                if value is None or compare is None or not value <= compare:
+                    return False
+
+            if has_crossovers:
+                prev_get = self._prev_values.get
+                # Was below or equal, now above
+                for key, rhs, scalar in cross_above:
+                    value = get(key)
+                    compare = rhs if scalar else get(rhs)
+                    prev_value = prev_get(key)
+                    if value is None or compare is None or prev_value is None:
+                        return False
+                    if not (prev_value <= compare and value > compare):
+                        return False
+                # Was above or equal, now below
+                for key, rhs, scalar in cross_below:
+                    value = get(key)
+                    compare = rhs if scalar else get(rhs)
+                    prev_value = prev_get(key)
+                    if value is None or compare is None or prev_value is None:
+                        return False
+                    if not (prev_value >= compare and value < compare):
+                        return False
+
+            return True
+
+        return check
 
     def get_indicator_status(self) -> dict:
         """Get current status of all indicators (for debugging/monitoring)."""
@@ -3,30 +3,32 @@ Strategy factory for creating strategy instances from configuration.
 """
 
 from decimal import Decimal
-from typing import Union
+from typing import Any, Union
 
 from app.core.strategy import Strategy
 from app.core.exceptions import StrategyNotFoundError
-from app.strategies.grid_strategy import GridStrategy
-from app.strategies.momentum_strategy import MomentumStrategy
-from app.strategies.custom_strategy import CustomStrategy
 
+_DEFAULT_ORDER_SIZE = Decimal("100")
+_DEFAULT_INITIAL_BALANCE = Decimal("10000")
 
-def _to_decimal(value, default: str) -> Decimal:
+
+def _to_decimal(value, default: Decimal) -> Decimal:
     """Convert value to Decimal, using default for empty/None values."""
     if value is None or value == "":
-        return Decimal(default)
+        return default
     if isinstance(value, Decimal):
         return value
     return Decimal(str(value))
 
 
-def create_strategy(config: dict) -> Strategy:
+def create_strategy(config: Any) -> Strategy:
     """
     Create a strategy instance from configuration.
 
     Args:
-        config: Strategy configuration with strategy_type and parameters
+        config: Strategy configuration with strategy_type and parameters, either
+            a dict or a validated strategy config model (anything with
+            to_factory_dict())
 
     Returns:
         Strategy instance
@@ -34,9 +36,15 @@ def create_strategy(config: dict) -> Strategy:
     Raises:
         StrategyNotFoundError: If strategy type is not recognized
     """
+    if not isinstance(config, dict):
+        config = config.to_factory_dict()
+
     strategy_type = config.get("strategy_type")
 
+    # Strategy modules are imported per branch so only the requested one is loaded
     if strategy_type == "grid":
+        from app.strategies.grid_strategy import GridStrategy
+
         return GridStrategy(
             grid_size=config.get("grid_size", 5),
             grid_spacing=config.get("grid_spacing"),
@@ -45,6 +53,8 @@ def create_strategy(config: dict) -> Strategy:
             protection_threshold=config.get("protection_threshold"),
         )
     elif strategy_type == "momentum":
+        from app.strategies.momentum_strategy import MomentumStrategy
+
         return MomentumStrategy(
             lookback_window=config.get("lookback_window", 10),
             momentum_threshold=config.get("momentum_threshold"),
@@ -52,12 +62,14 @@ def create_strategy(config: dict) -> Strategy:
             initial_balance=config.get("initial_balance"),
         )
     elif strategy_type == "custom":
+        from app.strategies.custom_strategy import CustomStrategy
+
         return CustomStrategy(
             indicators_config=config.get("indicators", []),
             buy_rules=config.get("buy_rules", []),
             sell_rules=config.get("sell_rules", []),
-            order_size=_to_decimal(config.get("order_size"), "100"),
-            initial_balance=_to_decimal(config.get("initial_balance"), "10000"),
+            order_size=_to_decimal(config.get("order_size"), _DEFAULT_ORDER_SIZE),
+            initial_balance=_to_decimal(config.get("initial_balance"), _DEFAULT_INITIAL_BALANCE),
         )
     else:
         raise StrategyNotFoundError(f"Unknown strategy type: {strategy_type}")
@@ -3,11 +3,13 @@ Grid trading strategy.
 Places buy/sell orders at fixed price intervals around a base price.
 """
 
+from bisect import bisect_left, bisect_right
 from decimal import Decimal
 from typing import Optional
 import pandas as pd
 
 from app.core.strategy import Strategy, Order
+from app.utils.data import to_decimal_price
 
 
 class GridStrategy(Strategy):
@@ -44,14 +46,30 @@ class GridStrategy(Strategy):
         self.protection_threshold = protection_threshold
 
         self.base_price: Optional[Decimal] = None
-        self.grid_levels: dict[str, Decimal] = {}
         self.last_level: Optional[int] = None
         self.protection_triggered: bool = False
 
+        # Raw level at or below which protection triggers (None: no protection)
+        self._protection_level: Optional[int] = (
+            -(grid_size + protection_threshold) if protection_threshold is not None else None
+        )
+
+        # Sorted float grid line prices, set by _setup_grid(). _level_edges[k] is
+        # the line of level _lowest_level + k; one extra line past the recenter
+        # (and protection) bounds on each side so out-of-grid prices still compare
+        # correctly.
+        self._lowest_level: int = -(grid_size + (protection_threshold or 0) + 1)
+        # Line price multipliers (1 + spacing * level) don't depend on the base,
+        # so recentering is one multiplication per line
+        self._level_multipliers: list[Decimal] = [
+            1 + grid_spacing * i for i in range(self._lowest_level, grid_size + 2)
+        ]
+        self._level_edges: list[float] = []
+        self._base_price_f: float = 0.0
+
     def on_start(self) -> None:
         """Reset grid state."""
         self.base_price = None
-        self.grid_levels = {}
         self.last_level = None
         self.protection_triggered = False
 
@@ -65,7 +83,6 @@ class GridStrategy(Strategy):
         - When price escapes grid bounds, recenter the grid
         - Protection threshold: if price drops too far, sell all and stop trading
         """
-        current_price = Decimal(str(trade_data["price"]))
         orders = []
 
         # If protection was triggered, don't trade anymore
@@ -74,42 +91,41 @@ class GridStrategy(Strategy):
 
         # Initialize base price on first trade
         if self.base_price is None:
-            self.base_price = current_price
+            self.base_price = to_decimal_price(trade_data["price"])
             self._setup_grid()
             self.last_level = 0
             return orders
 
-        # Determine current grid level (unclamped)
-        raw_level = self._get_raw_level(current_price)
+        # Determine current grid level (unclamped). Level math runs on floats;
+        # Decimal is only built when an order is placed or the grid recenters.
+        raw_level = self._get_raw_level(float(trade_data["price"]))
 
         # Check protection threshold - sell all if price drops too far below grid
-        if self.protection_threshold is not None:
-            protection_level = -(self.grid_size + self.protection_threshold)
-            if raw_level <= protection_level:
-                # Protection triggered! Sell all positions
-                self.protection_triggered = True
-                if self.state.position is not None and self.state.position.size > 0:
-                    # Close entire position
-                    orders.append(
-                        Order(
-                            side="sell",
-                            price=current_price,
-                            size=self.state.position.size,
-                            order_type="market",
-                        )
+        if self._protection_level is not None and raw_level <= self._protection_level:
+            # Protection triggered! Sell all positions
+            self.protection_triggered = True
+            if self.state.position is not None and self.state.position.size > 0:
+                # Close entire position
+                orders.append(
+                    Order(
+                        side="sell",
+                        price=to_decimal_price(trade_data["price"]),
+                        size=self.state.position.size,
+                        order_type="market",
                     )
-                return orders
+                )
+            return orders
 
         # If price escaped grid bounds (upward), recenter
         if raw_level > self.grid_size:
-            self.base_price = current_price
+            self.base_price = to_decimal_price(trade_data["price"])
             self._setup_grid()
             self.last_level = 0
             return orders
 
         # If price escaped grid bounds (downward) but not at protection level, recenter
         if raw_level < -self.grid_size:
-            self.base_price = current_price
+            self.base_price = to_decimal_price(trade_data["price"])
             self._setup_grid()
             self.last_level = 0
             return orders
@@ -118,6 +134,7 @@ class GridStrategy(Strategy):
 
         # Check if we crossed a grid level
         if self.last_level is not None and current_level != self.last_level:
+            current_price = to_decimal_price(trade_data["price"])
             # Price moved up -> sell
             if current_level > self.last_level:
                 if self.state.position is None or self.state.position.side == "long":
@@ -145,21 +162,31 @@ class GridStrategy(Strategy):
         return orders
 
     def _setup_grid(self) -> None:
-        """Setup grid levels around base price."""
+        """Setup grid line prices around base price."""
         if self.base_price is None:
             return
 
-        for i in range(-self.grid_size, self.grid_size + 1):
-            level_price = self.base_price * (1 + self.grid_spacing * i)
-            self.grid_levels[f"level_{i}"] = level_price
+        # Lines are computed exactly and then rounded, so a float price compares
+        # against them the same way its exact value would
+        self._level_edges = [
+            float(self.base_price * multiplier) for multiplier in self._level_multipliers
+        ]
+        self._base_price_f = float(self.base_price)
 
-    def _get_raw_level(self, price: Decimal) -> int:
-        """Get unclamped grid level."""
+    def _get_raw_level(self, price: float) -> int:
+        """
+        Get unclamped grid level.
+
+        Same as int((price / base_price - 1) / grid_spacing), i.e. truncated
+        toward zero, but saturates one level past the recenter/protection
+        bounds.
+        """
         if self.base_price is None:
             return 0
-        ratio = price / self.base_price - 1
-        return int(ratio / self.grid_spacing)
+        if price >= self._base_price_f:
+            return bisect_right(self._level_edges, price) - 1 + self._lowest_level
+        return bisect_left(self._level_edges, price) + self._lowest_level
 
-    def _get_grid_level(self, price: Decimal) -> int:
+    def _get_grid_level(self, price: float) -> int:
         """Determine which grid level the price is at (clamped)."""
         return max(-self.grid_size, min(self.grid_size, self._get_raw_level(price)))
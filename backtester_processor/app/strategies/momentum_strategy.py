@@ -4,9 +4,17 @@ Buys when price is trending up, sells when trending down.
 """
 
 from decimal import Decimal
+from typing import Optional
+import numpy as np
 import pandas as pd
 
 from app.core.strategy import Strategy, Order
+from app.utils.data import to_decimal_price
+from app.strategies._kernels import MOMENTUM_RECHECK, momentum_signals
+
+# Float momentum this close to the threshold is re-checked in Decimal, so
+# that e.g. 0.5 -> 0.55 against a 0.1 threshold stays exactly on it
+_BOUNDARY_TOLERANCE = 1e-9
 
 
 class MomentumStrategy(Strategy):
@@ -38,6 +46,59 @@ class MomentumStrategy(Strategy):
         self.momentum_threshold = momentum_threshold
         self.order_size = order_size
 
+        # Momentum math runs on floats; Decimal is only used for orders and
+        # for trades too close to the threshold to call in float
+        self._momentum_threshold = float(momentum_threshold)
+
+        # Per-row signals (1 long, -1 short, 0 none) from prepare();
+        # None means compute momentum per trade
+        self._signals: Optional[np.ndarray] = None
+        self._row: int = 0
+
+    def on_start(self) -> None:
+        """Drop signals precomputed for a previous run."""
+        self._signals = None
+        self._row = 0
+
+    def prepare(self, data: pd.DataFrame) -> None:
+        """
+        Precompute the momentum signal for every row of a market.
+
+        Row i compares against the price lookback_window - 1 rows earlier, the
+        same row on_trade() would read from historical_data. Rows without
+        enough history get no signal.
+        """
+        prices = data["price"].to_numpy(dtype=np.float64)
+        lag = self.lookback_window - 1
+        signals = momentum_signals(
+            prices, lag, self._momentum_threshold, _BOUNDARY_TOLERANCE
+        )
+        for i in np.flatnonzero(signals == MOMENTUM_RECHECK):
+            signals[i] = self._exact_signal(prices[i], prices[i - lag])
+        self._signals = signals
+        self._row = 0
+
+    def _signal(self, price: float, lookback_price: float) -> int:
+        """Momentum signal for one trade: 1 long, -1 short, 0 none."""
+        momentum = (price - lookback_price) / lookback_price
+        if abs(abs(momentum) - self._momentum_threshold) <= _BOUNDARY_TOLERANCE:
+            return self._exact_signal(price, lookback_price)
+        if momentum > self._momentum_threshold:
+            return 1
+        if momentum < -self._momentum_threshold:
+            return -1
+        return 0
+
+    def _exact_signal(self, price: float, lookback_price: float) -> int:
+        """Momentum signal computed in Decimal, for trades near the threshold."""
+        lookback = to_decimal_price(lookback_price)
+        momentum = (to_decimal_price(price) - lookback) / lookback
+        if momentum > self.momentum_threshold:
+            return 1
+        if momentum < -self.momentum_threshold:
+            return -1
+        return 0
+
     def on_trade(self, trade_data: pd.Series, historical_data: pd.DataFrame) -> list[Order]:
         """
         Process incoming trade and generate orders based on momentum.
@@ -46,20 +107,27 @@ class MomentumStrategy(Strategy):
         """
         orders = []
 
-        # Need enough historical data for lookback
-        if len(historical_data) < self.lookback_window:
+        if self._signals is not None and self._row < len(self._signals):
+            signal = self._signals[self._row]
+            self._row += 1
+        else:
+            # No signals, or past the rows prepare() saw: compute per trade
+            # Need enough historical data for lookback
+            if len(historical_data) < self.lookback_window:
+                return orders
+
+            # Get price from lookback_window trades ago (no future data - using historical_data).
+            # The current trade is the last row.
+            prices = historical_data["price"].to_numpy()
+            signal = self._signal(float(prices[-1]), float(prices[-self.lookback_window]))
+
+        if signal == 0:
             return orders
 
-        current_price = Decimal(str(trade_data["price"]))
-
-        # Get price from lookback_window trades ago (no future data - using historical_data)
-        lookback_price = Decimal(str(historical_data.iloc[-self.lookback_window]["price"]))
-
-        # Calculate momentum
-        momentum = (current_price - lookback_price) / lookback_price
+        current_price = to_decimal_price(trade_data["price"])
 
         # Generate signals
-        if momentum > self.momentum_threshold:
+        if signal > 0:
             # Positive momentum -> go long
             if self.state.position is None:
                 orders.append(
@@ -81,7 +149,7 @@ class MomentumStrategy(Strategy):
                     )
                 )
 
-        elif momentum < -self.momentum_threshold:
+        else:
             # Negative momentum -> go short
             if self.state.position is None:
                 orders.append(
@@ -2,8 +2,16 @@
 Data utilities for the backtester.
 """
 
+from decimal import Decimal
+from typing import Any
+
 import pandas as pd
 
+# Float price -> Decimal. Prediction market prices repeat heavily (cents,
+# half-cents), so most conversions become a dict lookup.
+_PRICE_CACHE_SIZE = 4096
+_price_cache: dict[float, Decimal] = {}
+
 
 def format_trades(trades: list[dict]) -> pd.DataFrame:
     """
@@ -16,12 +24,34 @@ def format_trades(trades: list[dict]) -> pd.DataFrame:
         DataFrame sorted by block_time with price column
     """
     df = pd.DataFrame(trades)
-    df.sort_values(by="block_time", inplace=True)
-    df.reset_index(drop=True, inplace=True)
+    # The repository already returns trades ordered by block_time
+    if not df["block_time"].is_monotonic_increasing:
+        df.sort_values(by="block_time", inplace=True)
+        df.reset_index(drop=True, inplace=True)
 
     # Use stored price from database if available and valid
-    # Only calculate from amounts as fallback (e.g., for legacy data)
-    if "price" not in df.columns or df["price"].isna().all():
+    # Only calculate from amounts as fallback (e.g., for legacy data).
+    # Probe the first row so the full-column scan only runs when it may be needed.
+    if "price" not in df.columns or (
+        len(df) and pd.isna(df["price"].iat[0]) and df["price"].isna().all()
+    ):
         df["price"] = df["taker_amount_filled"] / df["maker_amount_filled"]
 
     return df
+
+
+def to_decimal_price(value: Any) -> Decimal:
+    """
+    Convert a trade price to Decimal, same as Decimal(str(value)).
+
+    Float prices are memoized. Other types are converted directly since
+    e.g. Decimal("0.50") == 0.5 would otherwise share a cache entry.
+    """
+    if not isinstance(value, float):
+        return Decimal(str(value))
+    price = _price_cache.get(value)
+    if price is None:
+        price = Decimal(str(value))
+        if len(_price_cache) < _PRICE_CACHE_SIZE:
+            _price_cache[value] = price
+    return price
@@ -4,8 +4,10 @@ Serialization utilities for JSON-safe conversion of DataFrames and Decimals.
 
 from decimal import Decimal
 from typing import Any
+import orjson
 import pandas as pd
 import numpy as np
+from pydantic import BaseModel
 
 
 def decimal_to_str(value: Decimal) -> str:
@@ -23,19 +25,52 @@ def serialize_dataframe(df: pd.DataFrame) -> list[dict[str, Any]]:
     - np.int64/float64 -> Python int/float
     - NaN -> None
     """
-    result = []
+    # Convert column by column (one dtype check per column instead of per
+    # cell), then zip the columns back into row dicts
+    columns = {col: _serialize_column(df[col]) for col in df.columns}
+    if not columns:
+        return [{} for _ in range(len(df))]
+    return [dict(zip(columns, row)) for row in zip(*columns.values())]
 
-    for _, row in df.iterrows():
-        row_dict = {}
-        for col, value in row.items():
-            row_dict[col] = _serialize_value(value)
-        result.append(row_dict)
 
-    return result
+def _serialize_column(series: pd.Series) -> list[Any]:
+    """Convert a column to a list of JSON-serializable values."""
+    dtype = series.dtype
+    if isinstance(dtype, np.dtype):
+        # tolist() already yields Python int/float/bool
+        if dtype.kind in "iub":
+            return series.tolist()
+        if dtype.kind == "f":
+            return [None if value != value else value for value in series.tolist()]
+    if pd.api.types.is_datetime64_any_dtype(dtype):
+        return [None if value is pd.NaT else value.isoformat() for value in series]
+
+    # Classify object columns once so homogeneous ones skip per-value dispatch
+    inferred = pd.api.types.infer_dtype(series, skipna=False)
+    values = series.tolist()
+    if inferred == "string":
+        return values
+    if inferred == "decimal":
+        return [None if value.is_nan() else str(value) for value in values]
+    return [_serialize_value(value) for value in values]
 
 
 def _serialize_value(value: Any) -> Any:
     """Convert a single value to JSON-serializable type."""
+    # Exact-type fast paths for the common cells of mixed object columns;
+    # pd.isna() is only reached for other types
+    if value is None:
+        return None
+    value_type = type(value)
+    if value_type is str or value_type is int or value_type is bool:
+        return value
+    if value_type is float:
+        return None if value != value else value
+    if value_type is Decimal:
+        return None if value.is_nan() else str(value)
+    if value_type is pd.Timestamp:
+        return value.isoformat()
+
     if pd.isna(value):
         return None
     elif isinstance(value, Decimal):
@@ -50,3 +85,19 @@ def _serialize_value(value: Any) -> Any:
         return value.tolist()
     else:
         return value
+
+
+def dump_json_with_records(model: BaseModel, records_field: str) -> bytes:
+    """
+    JSON-encode a response model whose records_field holds serialized rows.
+
+    The rest of the model goes through pydantic; the rows, which dominate the
+    payload, are encoded with orjson and spliced in as the last key.
+    """
+    head = model.model_dump_json(exclude={records_field}).encode()
+    records = orjson.dumps(
+        getattr(model, records_field),
+        option=orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_NON_STR_KEYS,
+    )
+    separator = b"," if head != b"{}" else b""
+    return b"".join((head[:-1], separator, b'"', records_field.encode(), b'":', records, b"}"))
@@ -6,6 +6,7 @@ import pytest
 from datetime import datetime, timedelta
 from decimal import Decimal
 
+import numpy as np
 import pandas as pd
 
 
@@ -17,23 +18,25 @@ def mock_trades():
         start_time: datetime = datetime(2024, 1, 1, 12, 0, 0),
         interval_seconds: int = 60,
     ) -> pd.DataFrame:
-        trades = []
-        for i, price in enumerate(prices):
-            trades.append({
-                "id": i + 1,
-                "tx_hash": f"0x{i:064x}",
-                "block_number": 1000000 + i,
-                "block_time": start_time + timedelta(seconds=i * interval_seconds),
-                "maker": "0x" + "a" * 40,
-                "taker": "0x" + "b" * 40,
-                "maker_asset_id": "asset_1",
-                "taker_asset_id": "asset_2",
-                "maker_amount_filled": 100,
-                "taker_amount_filled": 100,
-                "fee": 1,
-                "side": "buy",
-                "price": price,
-                "created_at": start_time + timedelta(seconds=i * interval_seconds),
-            })
-        return pd.DataFrame(trades)
+        n = len(prices)
+        times = pd.to_datetime(
+            [start_time + timedelta(seconds=i * interval_seconds) for i in range(n)]
+        )
+        # Columnar construction: one typed array per column instead of a dict per row
+        return pd.DataFrame({
+            "id": np.arange(1, n + 1, dtype=np.int64),
+            "tx_hash": [f"0x{i:064x}" for i in range(n)],
+            "block_number": np.arange(1000000, 1000000 + n, dtype=np.int64),
+            "block_time": times,
+            "maker": ["0x" + "a" * 40] * n,
+            "taker": ["0x" + "b" * 40] * n,
+            "maker_asset_id": ["asset_1"] * n,
+            "taker_asset_id": ["asset_2"] * n,
+            "maker_amount_filled": np.full(n, 100, dtype=np.int64),
+            "taker_amount_filled": np.full(n, 100, dtype=np.int64),
+            "fee": np.full(n, 1, dtype=np.int64),
+            "side": ["buy"] * n,
+            "price": np.asarray(prices, dtype=np.float64),
+            "created_at": times,
+        })
     return _create_trades
@@ -2,10 +2,13 @@
 Unit tests for the backtester processor.
 """
 
+import functools
 import unittest
+from unittest import mock
 from decimal import Decimal
 from datetime import datetime, timedelta
 
+import numpy as np
 import pandas as pd
 
 from app.core.strategy import Strategy, Order, Position, Trade, StrategyState
@@ -19,25 +22,36 @@ def create_mock_trades(
     interval_seconds: int = 60,
 ) -> pd.DataFrame:
     """Create mock trade data for testing."""
-    trades = []
-    for i, price in enumerate(prices):
-        trades.append({
-            "id": i + 1,
-            "tx_hash": f"0x{i:064x}",
-            "block_number": 1000000 + i,
-            "block_time": start_time + timedelta(seconds=i * interval_seconds),
-            "maker": "0x" + "a" * 40,
-            "taker": "0x" + "b" * 40,
-            "maker_asset_id": "asset_1",
-            "taker_asset_id": "asset_2",
-            "maker_amount_filled": 100,
-            "taker_amount_filled": 100,
-            "fee": 1,
-            "side": "buy",
-            "price": price,
-            "created_at": start_time + timedelta(seconds=i * interval_seconds),
-        })
-    return pd.DataFrame(trades)
+    # Shallow copy: tests may add columns but don't modify the cached values
+    return _build_mock_trades(tuple(prices), start_time, interval_seconds).copy(deep=False)
+
+
+@functools.lru_cache(maxsize=128)
+def _build_mock_trades(
+    prices: tuple[float, ...],
+    start_time: datetime,
+    interval_seconds: int,
+) -> pd.DataFrame:
+    """Build (and cache) the mock trade frame for create_mock_trades()."""
+    n = len(prices)
+    idx = np.arange(n)
+    times = pd.Timestamp(start_time) + pd.to_timedelta(idx * interval_seconds, unit="s")
+    return pd.DataFrame({
+        "id": idx + 1,
+        "tx_hash": [f"0x{i:064x}" for i in range(n)],
+        "block_number": 1000000 + idx,
+        "block_time": times,
+        "maker": "0x" + "a" * 40,
+        "taker": "0x" + "b" * 40,
+        "maker_asset_id": "asset_1",
+        "taker_asset_id": "asset_2",
+        "maker_amount_filled": 100,
+        "taker_amount_filled": 100,
+        "fee": 1,
+        "side": "buy",
+        "price": np.asarray(prices, dtype=np.float64),
+        "created_at": times,
+    })
 
 
 class SimpleTestStrategy(Strategy):
@@ -150,6 +164,43 @@ class TestBacktesterNoLookAhead(unittest.TestCase):
         # Historical data should grow: 1, 2, 3, 4, 5
         self.assertEqual(strategy.received_data_lengths, [1, 2, 3, 4, 5])
 
+    def test_historical_data_is_not_copied(self):
+        """Verify that historical_data views the market data instead of copying it per trade."""
+        prices = [0.5, 0.51, 0.52]
+        df = create_mock_trades(prices)
+
+        received_prices = []
+
+        class HistoryRecorderStrategy(Strategy):
+            def on_trade(self, trade_data, historical_data):
+                received_prices.append(historical_data["price"].to_numpy())
+                return []
+
+        backtester = Backtester()
+        backtester.run(HistoryRecorderStrategy(), df)
+
+        self.assertEqual([list(p) for p in received_prices], [prices[:1], prices[:2], prices])
+        for earlier in received_prices[:-1]:
+            self.assertTrue(np.shares_memory(earlier, received_prices[-1]))
+
+    def test_trade_data_matches_row(self):
+        """Verify that trade_data is the same Series as the data's row."""
+        df = create_mock_trades([0.5, 0.51, 0.52])
+
+        received_rows = []
+
+        class RowRecorderStrategy(Strategy):
+            def on_trade(self, trade_data, historical_data):
+                received_rows.append((trade_data, historical_data.iloc[-1]))
+                return []
+
+        backtester = Backtester()
+        backtester.run(RowRecorderStrategy(), df)
+
+        self.assertEqual(len(received_rows), 3)
+        for trade_data, row in received_rows:
+            pd.testing.assert_series_equal(trade_data, row)
+
     def test_current_trade_is_last_in_historical(self):
         """Verify that the current trade is the last row in historical_data."""
         prices = [0.5, 0.51, 0.52, 0.53, 0.54]
@@ -330,6 +381,19 @@ class TestGridStrategy(unittest.TestCase):
 
         self.assertEqual(strategy.base_price, Decimal("0.5"))
 
+    def test_grid_level_matches_decimal_arithmetic(self):
+        """Test float grid levels agree with exact arithmetic, including on grid lines."""
+        for base, spacing in [("0.5", "0.01"), ("0.37", "0.02"), ("0.1", "0.03")]:
+            strategy = GridStrategy(grid_spacing=Decimal(spacing), protection_threshold=2)
+            strategy.base_price = Decimal(base)
+            strategy._setup_grid()
+            for mills in range(1, 1000):
+                price = Decimal(mills) / 1000
+                expected = int((price / Decimal(base) - 1) / Decimal(spacing))
+                # Levels saturate one past the recenter/protection bounds
+                expected = max(-8, min(6, expected))
+                self.assertEqual(strategy._get_raw_level(float(price)), expected, (base, spacing, price))
+
     def test_grid_trades_on_level_cross(self):
         """Test that grid trades when price crosses levels."""
         # Price moves up 5% (should cross grid level with 2% spacing)
@@ -398,6 +462,52 @@ class TestMomentumStrategy(unittest.TestCase):
         self.assertIsNotNone(strategy.state.position)
         self.assertEqual(strategy.state.position.side, "short")
 
+    def test_precomputed_momentum_matches_per_trade(self):
+        """Test prepare()'d momentum gives the same trades as computing it per trade."""
+        prices = [0.5, 0.52, 0.55, 0.53, 0.49, 0.47, 0.5, 0.54, 0.56, 0.52, 0.48, 0.5]
+        df = create_mock_trades(prices)
+
+        strategy = MomentumStrategy(lookback_window=3, momentum_threshold=Decimal("0.02"))
+        prepared = Backtester().run(strategy, df)
+
+        # Skip prepare() so on_trade falls back to historical_data
+        strategy.prepare = lambda data: None
+        per_trade = Backtester().run(strategy, df)
+
+        # Prepared on part of the market only: later trades fall back per trade
+        strategy.prepare = lambda data: MomentumStrategy.prepare(strategy, data.iloc[:6])
+        partial = Backtester().run(strategy, df)
+
+        self.assertGreater(prepared.statistics.total_trades, 0)
+        self.assertEqual(
+            [(t.side, t.price) for t in prepared.statistics.trades],
+            [(t.side, t.price) for t in per_trade.statistics.trades],
+        )
+        self.assertEqual(
+            [(t.side, t.price) for t in partial.statistics.trades],
+            [(t.side, t.price) for t in per_trade.statistics.trades],
+        )
+
+    def test_momentum_exactly_at_threshold(self):
+        """Test momentum exactly at the threshold does not trade, despite float rounding."""
+        cases = [
+            ([0.5, 0.55], Decimal("0.1")),
+            ([0.3, 0.33], Decimal("0.1")),
+            ([0.5, 0.51], Decimal("0.02")),
+            ([0.5, 0.45], Decimal("0.1")),
+        ]
+        for prices, threshold in cases:
+            df = create_mock_trades(prices)
+            strategy = MomentumStrategy(lookback_window=2, momentum_threshold=threshold)
+            with self.subTest(prices=prices, threshold=threshold):
+                Backtester().run(strategy, df)
+                self.assertIsNone(strategy.state.position)
+
+                # Per trade, without prepare()
+                strategy.prepare = lambda data: None
+                Backtester().run(strategy, df)
+                self.assertIsNone(strategy.state.position)
+
 
 class TestStrategyReset(unittest.TestCase):
     """Test strategy reset functionality."""
@@ -557,6 +667,21 @@ class TestContinuousMarketBacktesting(unittest.TestCase):
         # Should have market_id column
         self.assertIn("market_id", result.dataframe.columns)
 
+    def test_continuous_backtest_leaves_input_unchanged(self):
+        """Test that sorted market frames are not modified by the backtest."""
+        df1 = create_mock_trades([0.5, 0.55], start_time=datetime(2024, 1, 1, 12, 0, 0))
+        original = df1.copy()
+
+        class NoOpStrategy(Strategy):
+            def on_trade(self, trade_data, historical_data):
+                return []
+
+        backtester = Backtester()
+        backtester.run_continuous(NoOpStrategy(), [("market-1", df1)])
+        backtester.run(NoOpStrategy(), df1)
+
+        pd.testing.assert_frame_equal(df1, original)
+
     def test_continuous_backtest_empty_market_data(self):
         """Test that continuous backtest raises error for empty market data."""
         backtester = Backtester()
@@ -619,6 +744,81 @@ class TestBacktestRequestSchema(unittest.TestCase):
             )
         self.assertIn("clob_token_id", str(context.exception).lower())
 
+    def test_strategy_uses_tagged_union(self):
+        """Test that strategy configs are picked by strategy_type, not by trial."""
+        from app.schemas.backtest import BacktestRequest, MomentumStrategyConfig, REQUEST_ADAPTER
+
+        self.assertIn("tagged-union", str(BacktestRequest.__pydantic_core_schema__))
+
+        request = REQUEST_ADAPTER.validate_python({
+            "clob_token_id": "123456789",
+            "strategy": {"strategy_type": "momentum", "lookback_window": 5},
+        })
+        self.assertIsInstance(request.strategy, MomentumStrategyConfig)
+        self.assertEqual(request.strategy.lookback_window, 5)
+
+
+class TestResponseSerialization(unittest.TestCase):
+    """Test JSON encoding of backtest responses."""
+
+    def test_dump_json_with_records_matches_pydantic(self):
+        """Test the spliced orjson output parses to the same JSON as pydantic's."""
+        import json
+        from app.schemas.backtest import BacktestResponse, BacktestStatisticsResponse, TradeRecord
+        from app.utils.serialization import dump_json_with_records, serialize_dataframe
+
+        df = create_mock_trades([0.5, 0.52, 0.55, 0.53, 0.49, 0.47, 0.5])
+        result = Backtester().run(
+            MomentumStrategy(lookback_window=3, momentum_threshold=Decimal("0.02")), df
+        )
+        stats = result.statistics
+        self.assertGreater(stats.total_trades, 0)
+
+        response = BacktestResponse(
+            success=True,
+            statistics=BacktestStatisticsResponse(
+                strategy_name=stats.strategy_name,
+                initial_balance=stats.initial_balance,
+                final_equity=stats.final_equity,
+                total_pnl=stats.total_pnl,
+                total_return_pct=stats.total_return_pct,
+                total_trades=stats.total_trades,
+                winning_trades=stats.winning_trades,
+                losing_trades=stats.losing_trades,
+                win_rate=stats.win_rate,
+                max_drawdown=stats.max_drawdown,
+                max_drawdown_pct=stats.max_drawdown_pct,
+                sharpe_ratio=stats.sharpe_ratio,
+                trades=[
+                    TradeRecord(side=t.side, price=t.price, size=t.size, timestamp=t.timestamp, pnl=t.pnl)
+                    for t in stats.trades
+                ],
+            ),
+            dataframe=serialize_dataframe(result.dataframe),
+            row_count=len(result.dataframe),
+            columns=list(result.dataframe.columns),
+        )
+
+        self.assertEqual(
+            json.loads(dump_json_with_records(response, "dataframe")),
+            json.loads(response.model_dump_json()),
+        )
+
+    def test_dump_json_with_only_records(self):
+        """Test a model whose only field is the records field."""
+        import json
+        from pydantic import BaseModel
+        from app.utils.serialization import dump_json_with_records
+
+        class RecordsOnly(BaseModel):
+            rows: list[dict]
+
+        model = RecordsOnly(rows=[{"a": 1, "b": None}, {"a": 2.5, "b": "x"}])
+        self.assertEqual(
+            json.loads(dump_json_with_records(model, "rows")),
+            json.loads(model.model_dump_json()),
+        )
+
 
 class TestParseContinuousSlug(unittest.TestCase):
     """Test the parse_continuous_slug utility function."""
@@ -663,5 +863,166 @@ class TestParseContinuousSlug(unittest.TestCase):
         self.assertIsNone(result)
 
 
+class RepositoryTestCase(unittest.TestCase):
+    """Base for repository tests against a mocked database connection."""
+
+    def setUp(self):
+        from app.repository.polymarket import PolymarketRepository
+
+        with mock.patch.object(PolymarketRepository, "_init_db"):
+            self.repo = PolymarketRepository("postgresql://test")
+        self.repo.get_table_name_for_market = lambda clob_token_id: "hist_trades_123456789012345"
+
+        self.conn = mock.MagicMock()
+        self.cursor = self.conn.cursor.return_value.__enter__.return_value
+        connection = mock.MagicMock()
+        connection.__enter__.return_value = self.conn
+        self.repo.get_connection = lambda: connection
+
+    def executed(self) -> list[str]:
+        """SQL statements run on the cursor, with whitespace normalized."""
+        return [" ".join(c.args[0].split()) for c in self.cursor.execute.call_args_list]
+
+
+class TestGetTrades(RepositoryTestCase):
+    """Test get_trades query parameters."""
+
+    def test_offset_needs_limit(self):
+        """Test offset only applies together with a limit."""
+        self.repo.get_trades("123456789012345", offset=10)
+        self.assertEqual(self.cursor.execute.call_args.args[1], (None, 0))
+
+        self.repo.get_trades("123456789012345", limit=5, offset=10)
+        self.assertEqual(self.cursor.execute.call_args.args[1], (5, 10))
+
+    def test_rejects_unknown_order_column(self):
+        """Test order_by must be an allowed column."""
+        with self.assertRaises(ValueError):
+            self.repo.get_trades("123456789012345", order_by="price; DROP TABLE x")
+
+
+class TestTableNameCache(RepositoryTestCase):
+    """Test the clob_token_id -> hist_trades table name cache."""
+
+    def setUp(self):
+        super().setUp()
+        # Use the real lookup instead of the fixed table name
+        del self.repo.get_table_name_for_market
+
+    def test_first_miss_warms_whole_map(self):
+        """Test the first lookup loads every market's table name in one query."""
+        from app.repository.polymarket import get_table_name
+
+        self.cursor.fetchall.return_value = [
+            ("111", "222222222222222999"),
+            ("333", None),
+        ]
+
+        self.assertEqual(self.repo.get_table_name_for_market("111"), "hist_trades_222222222222222")
+        self.assertEqual(self.executed(), ["SELECT clob_token_id, yes_token_id FROM hist_markets"])
+        self.assertEqual(self.repo._table_name_cache, {
+            "111": "hist_trades_222222222222222",
+            "333": get_table_name("333"),
+        })
+
+    def test_warm_cache_issues_no_queries(self):
+        """Test lookups after warming are served from the cache."""
+        from app.repository.polymarket import get_table_name
+
+        self.cursor.fetchall.return_value = [("111", "222222222222222"), ("333", None)]
+        self.repo.get_table_name_for_market("111")
+        self.cursor.execute.reset_mock()
+
+        self.assertEqual(self.repo.get_table_name_for_market("333"), get_table_name("333"))
+        self.assertEqual(self.repo.get_table_name_for_market("111"), "hist_trades_222222222222222")
+        self.cursor.execute.assert_not_called()
+
+    def test_register_market_invalidates_entry(self):
+        """Test a (re-)registered market is looked up again after warming."""
+        from app.repository.polymarket import get_table_name
+
+        self.cursor.fetchall.return_value = [("111", None)]
+        self.assertEqual(self.repo.get_table_name_for_market("111"), get_table_name("111"))
+
+        self.repo.register_market("111", market_slug="some-market")
+        self.cursor.execute.reset_mock()
+        self.cursor.fetchone.return_value = ("444444444444444",)
+
+        self.assertEqual(self.repo.get_table_name_for_market("111"), "hist_trades_444444444444444")
+        self.assertEqual(len(self.executed()), 1)
+        self.assertIn("WHERE clob_token_id = %s", self.executed()[0])
+        self.assertEqual(self.cursor.execute.call_args.args[1], ("111",))
+
+        # Cached again, and a market that was never warmed is picked up too
+        self.cursor.execute.reset_mock()
+        self.cursor.fetchone.return_value = ("555555555555555",)
+        self.assertEqual(self.repo.get_table_name_for_market("111"), "hist_trades_444444444444444")
+        self.assertEqual(self.repo.get_table_name_for_market("666"), "hist_trades_555555555555555")
+        self.assertEqual(self.cursor.execute.call_count, 1)
+
+
+class TestCopyTrades(RepositoryTestCase):
+    """Test bulk inserting trades through a staging table."""
+
+    def test_stages_in_temp_table(self):
+        """Test copy_trades stages rows in a table dropped at commit."""
+        self.cursor.rowcount = 1
+        trade = {"tx_hash": "0xabc", "block_number": 1, "maker": "0x1", "side": "buy", "price": "0.5"}
+
+        inserted = self.repo.copy_trades("123456789012345", [trade])
+
+        self.assertEqual(inserted, 1)
+        statements = self.executed()
+        self.assertTrue(statements[0].startswith("CREATE TEMP TABLE trades_stage ON COMMIT DROP AS SELECT"))
+        self.assertTrue(statements[0].endswith("FROM hist_trades_123456789012345 WITH NO DATA"))
+        self.assertTrue(statements[1].startswith("INSERT INTO hist_trades_123456789012345"))
+        self.assertIn("FROM trades_stage ON CONFLICT", statements[1])
+
+        sql, buf = self.cursor.copy_expert.call_args.args
+        self.assertTrue(sql.startswith("COPY trades_stage ("))
+        self.assertEqual(buf.getvalue(), "0xabc\t1\t\\N\t0x1\t\\N\t\t\t\\N\t\\N\t\\N\tbuy\t0.5\n")
+
+    def test_no_trades_skips_database(self):
+        """Test an empty batch does not open a connection."""
+        self.assertEqual(self.repo.copy_trades("123456789012345", []), 0)
+        self.cursor.execute.assert_not_called()
+
+
+class TestBulkLoadIndexes(RepositoryTestCase):
+    """Test dropping and recreating secondary indexes around a backfill."""
+
+    def test_begin_drops_secondary_indexes(self):
+        """Test bulk_load_begin drops the block_time/maker/taker indexes."""
+        self.repo.bulk_load_begin("123456789012345")
+
+        self.assertEqual(self.executed(), [
+            "DROP INDEX IF EXISTS idx_123456789012345_block_time, "
+            "idx_123456789012345_maker, idx_123456789012345_taker",
+        ])
+
+    def test_end_rebuilds_invalid_indexes(self):
+        """Test bulk_load_end drops INVALID leftovers before recreating indexes."""
+        self.cursor.fetchall.return_value = [("idx_123456789012345_maker",)]
+
+        self.repo.bulk_load_end("123456789012345")
+
+        self.assertTrue(self.conn.autocommit)
+        statements = self.executed()
+        self.assertIn("NOT i.indisvalid", statements[0])
+        self.assertEqual(
+            self.cursor.execute.call_args_list[0].args[1][1],
+            ["idx_123456789012345_block_time", "idx_123456789012345_maker", "idx_123456789012345_taker"],
+        )
+        self.assertEqual(statements[1:], [
+            "DROP INDEX CONCURRENTLY IF EXISTS idx_123456789012345_maker",
+            "CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_123456789012345_block_time "
+            "ON hist_trades_123456789012345(block_time)",
+            "CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_123456789012345_maker "
+            "ON hist_trades_123456789012345(maker)",
+            "CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_123456789012345_taker "
+            "ON hist_trades_123456789012345(taker)",
+        ])
+
+
 if __name__ == "__main__":
     unittest.main()
@@ -14,14 +14,16 @@ from app.strategies.custom_strategy import (
     IndicatorCondition,
     SignalRule,
 )
-from app.core.strategy import Order
+from app.core.strategy import Order, Position
 
 
 # =============================================================================
 # Fixtures
 # =============================================================================
 
-@pytest.fixture
+# Module-scoped: the factories are stateless and tests only read the configs
+
+@pytest.fixture(scope="module")
 def sample_trade_data():
     """Create a sample trade Series."""
     def _create(price: float, timestamp: datetime = None):
@@ -36,7 +38,7 @@ def sample_trade_data():
     return _create
 
 
-@pytest.fixture
+@pytest.fixture(scope="module")
 def sample_historical_data():
     """Create sample historical DataFrame."""
     def _create(prices: list[float], start_time: datetime = None):
@@ -55,7 +57,7 @@ def sample_historical_data():
     return _create
 
 
-@pytest.fixture
+@pytest.fixture(scope="module")
 def ema_crossover_config():
     """Standard EMA crossover strategy config."""
     return {
@@ -72,7 +74,7 @@ def ema_crossover_config():
     }
 
 
-@pytest.fixture
+@pytest.fixture(scope="module")
 def rsi_strategy_config():
     """RSI overbought/oversold strategy config."""
     return {
@@ -146,6 +148,15 @@ class TestCustomStrategyCreation:
                 sell_rules=config["sell_rules"],
             )
 
+    def test_unknown_rule_indicator(self):
+        """Test that a rule referencing an unconfigured indicator raises error."""
+        with pytest.raises(ValueError, match="Unknown indicator in sell rule: slow_ema"):
+            CustomStrategy(
+                indicators_config=[{"type": "ema", "name": "fast_ema", "period": 3}],
+                buy_rules=[],
+                sell_rules=[{"indicator": "fast_ema", "operator": "<", "compare_to_indicator": "slow_ema"}],
+            )
+
     def test_rule_parsing(self, ema_crossover_config):
         """Test that rules are parsed correctly."""
         strategy = CustomStrategy(
@@ -195,8 +206,10 @@ class TestCustomStrategyCreation:
 def run_strategy_on_prices(strategy, prices, sample_trade_data, sample_historical_data):
     """Helper to simulate backtest loop - processes prices one by one."""
     all_orders = []
+    # Build the history once and pass growing views of it, like the backtester
+    history = sample_historical_data(prices)
     for i, price in enumerate(prices):
-        historical = sample_historical_data(prices[:i+1])
+        historical = history.iloc[:i+1]
         trade = sample_trade_data(price)
         orders = strategy.on_trade(trade, historical)
         all_orders.extend(orders)
@@ -302,47 +315,23 @@ class TestSignalGeneration:
 class TestConditionOperators:
     """Tests for different condition operators."""
 
-    def test_greater_than(self, sample_trade_data, sample_historical_data):
-        """Test greater than operator."""
-        strategy = CustomStrategy(
-            indicators_config=[{"type": "sma", "name": "sma", "period": 3}],
-            buy_rules=[{"indicator": "sma", "operator": ">", "value": 100}],
-            sell_rules=[],
-        )
-        strategy.on_start()
-
-        # SMA should be > 100 after warmup
-        prices = [101.0, 102.0, 103.0, 104.0]  # SMA = 103 on last price
-        orders = run_strategy_on_prices(strategy, prices, sample_trade_data, sample_historical_data)
-
-        assert len(orders) >= 1
-
-    def test_less_than(self, sample_trade_data, sample_historical_data):
-        """Test less than operator."""
-        strategy = CustomStrategy(
-            indicators_config=[{"type": "sma", "name": "sma", "period": 3}],
-            buy_rules=[{"indicator": "sma", "operator": "<", "value": 100}],
-            sell_rules=[],
-        )
-        strategy.on_start()
-
-        # SMA should be < 100 after warmup
-        prices = [95.0, 96.0, 97.0, 98.0]  # SMA = 97 on last price
-        orders = run_strategy_on_prices(strategy, prices, sample_trade_data, sample_historical_data)
-
-        assert len(orders) >= 1
-
-    def test_greater_than_or_equal(self, sample_trade_data, sample_historical_data):
-        """Test greater than or equal operator."""
+    @pytest.mark.parametrize("operator, prices", [
+        # SMA should be > 100 after warmup: SMA = 103 on last price
+        (">", [101.0, 102.0, 103.0, 104.0]),
+        # SMA should be < 100 after warmup: SMA = 97 on last price
+        ("<", [95.0, 96.0, 97.0, 98.0]),
+        # SMA should be >= 100 after warmup: SMA = 100.33 on last price
+        (">=", [99.0, 100.0, 101.0, 100.0]),
+    ], ids=["greater_than", "less_than", "greater_than_or_equal"])
+    def test_compare_to_value(self, operator, prices, sample_trade_data, sample_historical_data):
+        """Test comparison operators against a fixed value."""
         strategy = CustomStrategy(
             indicators_config=[{"type": "sma", "name": "sma", "period": 3}],
-            buy_rules=[{"indicator": "sma", "operator": ">=", "value": 100}],
+            buy_rules=[{"indicator": "sma", "operator": operator, "value": 100}],
             sell_rules=[],
         )
         strategy.on_start()
 
-        # SMA should be >= 100 after warmup
-        prices = [99.0, 100.0, 101.0, 100.0]  # SMA = 100.33 on last price
         orders = run_strategy_on_prices(strategy, prices, sample_trade_data, sample_historical_data)
 
         assert len(orders) >= 1
@@ -384,10 +373,7 @@ class TestStateManagement:
 
         # Process some data
         prices = [100.0 + i for i in range(10)]
-        for i, price in enumerate(prices):
-            historical = sample_historical_data(prices[:i+1])
-            trade = sample_trade_data(price)
-            strategy.on_trade(trade, historical)
+        run_strategy_on_prices(strategy, prices, sample_trade_data, sample_historical_data)
 
         # Get value after processing
         first_value = strategy.manager.get_value("ema")
@@ -395,10 +381,7 @@ class TestStateManagement:
         # Reset and process same data
         strategy.on_start()  # This calls reset
 
-        for i, price in enumerate(prices):
-            historical = sample_historical_data(prices[:i+1])
-            trade = sample_trade_data(price)
-            strategy.on_trade(trade, historical)
+        run_strategy_on_prices(strategy, prices, sample_trade_data, sample_historical_data)
 
         second_value = strategy.manager.get_value("ema")
 
@@ -419,10 +402,7 @@ class TestStateManagement:
 
         # Process some data
         prices = [100.0 + i for i in range(10)]
-        for i, price in enumerate(prices):
-            historical = sample_historical_data(prices[:i+1])
-            trade = sample_trade_data(price)
-            strategy.on_trade(trade, historical)
+        run_strategy_on_prices(strategy, prices, sample_trade_data, sample_historical_data)
 
         status = strategy.get_indicator_status()
 
@@ -431,6 +411,82 @@ class TestStateManagement:
         assert "rsi" in status["indicators"]
         assert status["indicators"]["ema"]["is_ready"] is True
 
+    def test_prepare_matches_per_trade_signals(self, sample_trade_data, sample_historical_data):
+        """Test that precomputed signals produce the same orders as per-trade evaluation."""
+        def make_strategy():
+            return CustomStrategy(
+                indicators_config=[
+                    {"type": "ema", "name": "fast", "period": 3},
+                    {"type": "ema", "name": "slow", "period": 6},
+                ],
+                buy_rules=[{"indicator": "fast", "operator": "cross_above", "compare_to_indicator": "slow"}],
+                sell_rules=[{"indicator": "fast", "operator": "cross_below", "compare_to_indicator": "slow"}],
+            )
+
+        prices = [100.0, 98.0, 96.0, 95.0, 94.0, 93.0, 95.0, 99.0, 104.0, 108.0,
+                  106.0, 101.0, 96.0, 92.0, 90.0, 93.0, 98.0, 103.0]
+
+        history = sample_historical_data(prices)
+
+        def run(strategy):
+            sides = []
+            values = []
+            for i, price in enumerate(prices):
+                orders = strategy.on_trade(sample_trade_data(price), history.iloc[:i+1])
+                # The live indicators only ever reflect the trades seen so far
+                values.append(strategy.manager.get_value("fast", require_ready=False))
+                for order in orders:
+                    sides.append((i, order.side))
+                    if order.side == "buy":
+                        strategy.state.position = Position(
+                            side="long", entry_price=order.price, size=order.size,
+                            entry_time=datetime.now(),
+                        )
+                    else:
+                        strategy.state.position = None
+            return sides, values
+
+        incremental = make_strategy()
+        incremental.on_start()
+        expected = run(incremental)
+
+        precomputed = make_strategy()
+        precomputed.on_start()
+        precomputed.prepare(sample_historical_data(prices))
+        actual = run(precomputed)
+
+        assert expected[0]
+        assert actual == expected
+
+        # Trades past the prepared rows fall back to per-trade evaluation
+        partial = make_strategy()
+        partial.on_start()
+        partial.prepare(sample_historical_data(prices[:10]))
+        assert run(partial) == expected
+
+    def test_fixed_value_comparison_ignores_float_rounding(self, sample_trade_data, sample_historical_data):
+        """Test an indicator equal to a rule's value compares equal despite float rounding."""
+        # SMA(3) of 0.1, 0.2, 0.3 is 0.2, but 0.20000000000000004 in float
+        prices = [0.1, 0.2, 0.3, 0.4]
+        history = sample_historical_data(prices)
+
+        def first_buy(prepare: bool) -> int:
+            strategy = CustomStrategy(
+                indicators_config=[{"type": "sma", "name": "sma", "period": 3}],
+                buy_rules=[{"indicator": "sma", "operator": ">", "value": 0.2}],
+                sell_rules=[],
+            )
+            strategy.on_start()
+            if prepare:
+                strategy.prepare(history)
+            for i, price in enumerate(prices):
+                if strategy.on_trade(sample_trade_data(price), history.iloc[:i+1]):
+                    return i
+            return -1
+
+        assert first_buy(prepare=False) == 3
+        assert first_buy(prepare=True) == 3
+
 
 # =============================================================================
 # Factory Integration Tests
@@ -464,6 +520,23 @@ class TestFactoryIntegration:
         assert isinstance(strategy, CustomStrategy)
         assert len(strategy.manager) == 2
 
+    def test_create_via_factory_from_config_model(self):
+        """Test that the factory accepts a validated config model directly."""
+        from app.schemas.backtest import CustomStrategyConfig
+        from app.strategies.factory import create_strategy
+
+        config = CustomStrategyConfig(
+            indicators=[{"type": "rsi", "name": "rsi", "period": 7}],
+            buy_rules=[{"conditions": [{"indicator": "rsi", "operator": "<", "value": 30}]}],
+            sell_rules=[{"conditions": [{"indicator": "rsi", "operator": ">", "value": 70}]}],
+        )
+
+        strategy = create_strategy(config)
+
+        assert isinstance(strategy, CustomStrategy)
+        assert strategy.order_size == Decimal("100")
+        assert strategy.buy_rules[0].conditions[0].compare_to_value == 30.0
+
 
 # =============================================================================
 # Edge Cases
@@ -6,6 +6,8 @@ import pytest
 from decimal import Decimal
 from typing import List
 
+import numpy as np
+
 from app.indicators import (
     Indicator,
     IndicatorConfig,
@@ -16,6 +18,7 @@ from app.indicators import (
     BollingerBands,
     IndicatorManager,
     IndicatorSnapshot,
+    IndicatorSeries,
     ManagerState,
     IndicatorError,
     IndicatorNotReadyError,
@@ -29,7 +32,7 @@ from app.indicators import (
 # Test Fixtures
 # =============================================================================
 
-@pytest.fixture
+@pytest.fixture(scope="module")
 def sample_prices() -> List[Decimal]:
     """Generate sample price data for testing."""
     # Simulates a price series with some trend and volatility
@@ -43,19 +46,19 @@ def sample_prices() -> List[Decimal]:
     ]]
 
 
-@pytest.fixture
+@pytest.fixture(scope="module")
 def trending_up_prices() -> List[Decimal]:
     """Steadily increasing prices."""
     return [Decimal(str(100 + i)) for i in range(50)]
 
 
-@pytest.fixture
+@pytest.fixture(scope="module")
 def trending_down_prices() -> List[Decimal]:
     """Steadily decreasing prices."""
     return [Decimal(str(150 - i)) for i in range(50)]
 
 
-@pytest.fixture
+@pytest.fixture(scope="module")
 def flat_prices() -> List[Decimal]:
     """Constant prices."""
     return [Decimal("100")] * 50
@@ -685,3 +688,121 @@ class TestIndicatorIntegration:
 
         # Should produce identical results
         assert manager1.get_value("ema") == manager2.get_value("ema")
+
+
+# =============================================================================
+# Vectorized compute() Tests
+# =============================================================================
+
+def _update_series(indicator: Indicator, prices: List[float]) -> np.ndarray:
+    """Values from calling update() per price, NaN where it returned None."""
+    values = [indicator.update(p) for p in prices]
+    return np.array([np.nan if v is None else v for v in values], dtype=float)
+
+
+class TestVectorizedCompute:
+    """compute() must match update() value-for-value and leave the same state."""
+
+    @pytest.mark.parametrize("make_indicator", [
+        lambda: SMA(5),
+        lambda: EMA(5),
+        lambda: RSI(5),
+        lambda: MACD(3, 6, 4),
+        lambda: BollingerBands(5, num_std=1.5),
+    ], ids=["sma", "ema", "rsi", "macd", "bollinger"])
+    def test_compute_matches_update_across_chunks(self, sample_prices, make_indicator):
+        """Test compute() in chunks equals update() per price, including state."""
+        prices = [float(p) for p in sample_prices]
+        expected_ind = make_indicator()
+        expected = _update_series(expected_ind, prices)
+
+        indicator = make_indicator()
+        chunks = [prices[:2], prices[2:11], prices[11:]]
+        actual = np.concatenate([indicator.compute(np.array(c)) for c in chunks])
+
+        np.testing.assert_array_equal(actual, expected)
+        assert indicator.value == expected_ind.value
+        assert indicator._samples_processed == expected_ind._samples_processed
+
+        # Continuing with update() after compute() gives the same value
+        assert indicator.update(120.0) == expected_ind.update(120.0)
+
+    def test_compute_all_composite_outputs(self, sample_prices):
+        """Test MACD and Bollinger extra outputs match their properties."""
+        prices = [float(p) for p in sample_prices]
+        macd = MACD(3, 6, 4)
+        bb = BollingerBands(5)
+        macd_outputs = macd.compute_all(np.array(prices))
+        bb_outputs = bb.compute_all(np.array(prices))
+
+        assert macd_outputs["signal"][-1] == macd.signal
+        assert macd_outputs["histogram"][-1] == macd.histogram
+        assert bb_outputs["upper"][-1] == bb.upper
+        assert bb_outputs["lower"][-1] == bb.lower
+        assert bb_outputs["bandwidth"][-1] == bb.bandwidth
+
+    def test_manager_compute(self, sample_prices):
+        """Test manager.compute() names outputs and marks all-ready rows."""
+        manager = IndicatorManager()
+        manager.add("ema", EMA(5))
+        manager.add("macd", MACD(3, 6, 4))
+        manager.reset()
+
+        series = manager.compute(np.array([float(p) for p in sample_prices]))
+
+        assert isinstance(series, IndicatorSeries)
+        assert set(series.values) == {"ema", "macd", "macd_signal", "macd_histogram"}
+        # MACD warmup is 6 + 4 = 10 samples
+        assert not series.all_ready[:9].any()
+        assert series.all_ready[9:].all()
+        assert series.samples_processed == len(sample_prices)
+        assert manager.state == ManagerState.RUNNING
+
+    def test_manager_compute_requires_reset(self):
+        """Test compute() enforces reset like update()."""
+        manager = IndicatorManager()
+        manager.add("ema", EMA(5))
+        manager.reset()
+        manager.mark_dirty()
+
+        with pytest.raises(ManagerNotResetError):
+            manager.compute(np.array([1.0, 2.0]))
+
+
+# =============================================================================
+# Output Type Tests
+# =============================================================================
+
+class TestOutputTypes:
+    """Tests that outputs follow the type of the prices fed in."""
+
+    @pytest.mark.parametrize("price_type", [Decimal, float], ids=["decimal", "float"])
+    def test_outputs_match_price_type(self, sample_prices, price_type):
+        """Test update(), value and composite outputs all share the price type."""
+        macd = MACD(fast_period=3, slow_period=5, signal_period=2)
+        bb = BollingerBands(period=5)
+        manager = IndicatorManager()
+        manager.add("ema", EMA(5))
+        manager.reset()
+
+        for price in sample_prices[:15]:
+            result = macd.update(price_type(price))
+            bb.update(price_type(price))
+            snapshot = manager.update(price_type(price))
+
+        outputs = [
+            result, macd.value, macd.signal, macd.histogram,
+            bb.value, bb.upper, bb.lower, bb.middle, bb.bandwidth,
+            snapshot.get("ema"), manager.get_value("ema"),
+        ]
+        assert all(type(output) is price_type for output in outputs)
+
+    def test_compute_returns_to_float_outputs(self, sample_prices):
+        """Test compute() on a float array switches value back to float."""
+        ema = EMA(5)
+        for price in sample_prices[:10]:
+            ema.update(price)
+        assert isinstance(ema.value, Decimal)
+
+        ema.compute(np.array([float(p) for p in sample_prices[10:]]))
+        assert type(ema.value) is float